@@ -3,7 +3,15 @@ from src.data_processor import load_and_clean_data
 from src.db.graph_db import GraphDatabase
 from src.db.vector_search import VectorSearch
 from src.db.text_search import TextSearch
+from src.db.name_index import NameIndex
+from src.db.facets import FacetStore
+from src.batch_runner import BatchRunner
+from src.catalog import refresh_facets
+from src.config import BATCH_WORKERS, BATCH_SIZE, FACETS_PATH
+from contextlib import redirect_stdout
+import argparse
 import os
+import sys
 import time
 
 def clear_screen():
@@ -21,7 +29,7 @@ def initialize_database():
     df = load_and_clean_data()
     
     # Initialize graph database
-    graph_db = GraphDatabase()
+    graph_db = GraphDatabase(name_index=NameIndex.from_dataframe(df))
     graph_db.clear_database()
     
     # Add movies to graph database
@@ -37,6 +45,9 @@ def initialize_database():
     print("Creating embeddings for vector search...")
     vector_search.create_embeddings(df)
     
+    print("Materializing facet aggregates...")
+    refresh_facets(df)
+    
     return graph_db, vector_search
 
 def display_menu():
@@ -66,7 +77,7 @@ def main():
         # Initialize text search
         text_search = TextSearch()
         
-        graph_db = GraphDatabase()  # Just connect, don't reinitialize
+        graph_db = GraphDatabase(name_index=NameIndex.from_dataframe(df))  # Just connect, don't reinitialize
         
 
         while True:
@@ -205,6 +216,7 @@ def main():
                 print("====================")
                 print("This may take several minutes. Please wait...")
                 graph_db.close()  # Close the current connection
+                vector_search.close()
                 graph_db, vector_search = initialize_database()
                 # Recreate text search with new vector search
                 text_search = TextSearch()
@@ -227,6 +239,49 @@ def main():
         # Make sure to close the database connection when exiting
         if 'graph_db' in locals():
             graph_db.close()
+        if 'vector_search' in locals():
+            vector_search.close()
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Movie Search Engine - Graph vs Vector Databases")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="Run queries from FILE ('-' for stdin) and write JSONL results to stdout")
+    parser.add_argument("--workers", type=int, default=BATCH_WORKERS,
+                        help="Threads running batch queries (default: number of cores)")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help="Text/vector queries encoded together")
+    parser.add_argument("--top-k", type=int, default=10, help="Results per query")
+    return parser.parse_args()
+
+def run_batch(args):
+    """Run queries non-interactively and stream results as JSONL."""
+    out = sys.stdout
+    # Keep stdout clean for results, setup messages go to stderr
+    with redirect_stdout(sys.stderr):
+        text_search = TextSearch()
+        if os.path.exists(FACETS_PATH):
+            facets = FacetStore.load()
+        else:
+            facets = refresh_facets(text_search.df)
+    graph_db = text_search.graph_db
+    vector_search = text_search.vector_search
+    
+    runner = BatchRunner(graph_db, vector_search, text_search, facets=facets,
+                         workers=args.workers, batch_size=args.batch_size, top_k=args.top_k)
+    try:
+        if args.batch == '-':
+            count = runner.run(sys.stdin, out)
+        else:
+            with open(args.batch) as f:
+                count = runner.run(f, out)
+        print(f"Ran {count} queries", file=sys.stderr)
+    finally:
+        graph_db.close()
+        vector_search.close()
 
 if __name__ == "__main__":
-    main() 
\ No newline at end of file
+    args = parse_args()
+    if args.batch:
+        run_batch(args)
+    else:
+        main() 
\ No newline at end of file
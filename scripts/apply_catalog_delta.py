@@ -0,0 +1,44 @@
+from src.data_processor import load_and_clean_data, update_dataset
+from src.db.graph_db import GraphDatabase
+from src.db.vector_search import VectorSearch
+from src.catalog import upsert_movies, delete_movies
+import argparse
+import time
+
+def main():
+    """Apply a catalog delta to the graph, the vector index and the dataset CSV."""
+    parser = argparse.ArgumentParser(description="Apply new, changed and removed movies incrementally")
+    parser.add_argument("--upsert", help="CSV of new or changed movies (same columns as the dataset)")
+    parser.add_argument("--delete", nargs="*", default=[], help="Titles of movies to remove")
+    args = parser.parse_args()
+    
+    if not args.upsert and not args.delete:
+        parser.error("nothing to do, pass --upsert and/or --delete")
+    
+    start = time.time()
+    graph_db = GraphDatabase()
+    vector_search = VectorSearch()
+    vector_search.df = load_and_clean_data()
+    
+    try:
+        if args.upsert:
+            delta = load_and_clean_data(args.upsert)
+            counts = upsert_movies(delta, graph_db, vector_search)
+            print(f"Upserted {len(delta)} movies: {counts['added']} added, "
+                  f"{counts['updated']} updated, {counts['unchanged']} unchanged, "
+                  f"{counts['encoded']} re-embedded")
+        
+        if args.delete:
+            deleted = delete_movies(args.delete, graph_db, vector_search)
+            print(f"Deleted {deleted} movies")
+        
+        # Keep the dataset in step so the next full load sees the same catalog
+        update_dataset(args.upsert, args.delete)
+    finally:
+        graph_db.close()
+        vector_search.close()
+    
+    print(f"Done in {time.time() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+from src.db.vector_search import VectorSearch
+from src.db.knn_graph import build_knn_graph
+from src.config import KNN_GRAPH_PATH, KNN_K
+import argparse
+import time
+
+def main():
+    """Precompute every movie's nearest neighbors from the stored embeddings."""
+    parser = argparse.ArgumentParser(description="Build the all-pairs k-nearest-neighbor table")
+    parser.add_argument("--k", type=int, default=KNN_K, help="Neighbors per movie")
+    parser.add_argument("--output", default=KNN_GRAPH_PATH, help="Where to save the neighbor table")
+    parser.add_argument("--write-graph", action="store_true",
+                        help="Also write SIMILAR_TO relationships to Neo4j")
+    args = parser.parse_args()
+    
+    vector_search = VectorSearch()
+    try:
+        ids, vectors = vector_search.get_all_vectors()
+        print(f"Computing {args.k} nearest neighbors for {len(ids)} movies...")
+        start = time.time()
+        table = build_knn_graph(ids, vectors, k=args.k, index_checksum=vector_search.index_checksum)
+        table.save(args.output)
+        print(f"Saved neighbor table to {args.output} in {time.time() - start:.1f}s")
+        
+        if args.write_graph:
+            from src.db.graph_db import GraphDatabase
+            titles = vector_search.index_to_movie
+            graph_db = GraphDatabase()
+            try:
+                print("Writing SIMILAR_TO relationships to graph database...")
+                graph_db.write_similar_edges(
+                    (titles[source], titles[target], score)
+                    for source, target, score in table.edges()
+                )
+            finally:
+                graph_db.close()
+    finally:
+        vector_search.close()
+
+if __name__ == "__main__":
+    main()
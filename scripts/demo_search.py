@@ -2,6 +2,7 @@ from src.data_processor import load_and_clean_data
 from src.db.graph_db import GraphDatabase
 from src.db.vector_search import VectorSearch
 from src.db.text_search import TextSearch
+from src.db.name_index import NameIndex
 import time
 
 def run_demo():
@@ -24,7 +25,7 @@ def run_demo():
     
     # Connect to graph database
     print("Connecting to graph database...\n")
-    graph_db = GraphDatabase()
+    graph_db = GraphDatabase(name_index=NameIndex.from_dataframe(df))
     
     # Demo 1: Actor in Genre searches
     print("\n1. GRAPH DB: ACTORS IN GENRES")
@@ -0,0 +1,59 @@
+from src.data_processor import load_and_clean_data
+from src.db.vector_search import VectorSearch
+from src.db.encoders import (
+    TorchEncoder, OnnxEncoder, export_onnx_model, check_parity, compare_latency
+)
+from src.config import ONNX_MODEL_DIR, ONNX_PARITY_MIN_COSINE
+import sys
+
+SAMPLE_QUERIES = [
+    "Mafia family drama with excellent acting",
+    "Space adventure with amazing visuals",
+    "Psychological thriller with plot twists",
+    "War movie showing the horrors of combat",
+    "I want to watch some drama movie today",
+    "Looking for an action movie with explosions",
+    "I need a good comedy to cheer me up",
+    "Show me sci-fi movies about space travel",
+]
+
+def main():
+    """Export the ONNX query encoder, then check parity and latency against PyTorch."""
+    print(f"Exporting ONNX encoder to {ONNX_MODEL_DIR}...")
+    export_onnx_model(ONNX_MODEL_DIR, quantize=True)
+
+    vector_search = VectorSearch(encoder_backend='torch')
+    vector_search.load_embeddings()
+    reference = TorchEncoder(vector_search.model)
+    candidates = {
+        'onnx-fp32': OnnxEncoder(ONNX_MODEL_DIR, quantized=False),
+        'onnx-int8': OnnxEncoder(ONNX_MODEL_DIR, quantized=True),
+    }
+
+    df = load_and_clean_data()
+    texts = SAMPLE_QUERIES + df['text_for_embedding'].sample(200, random_state=0).tolist()
+
+    print("\nPARITY (vs PyTorch reference)")
+    print("=============================")
+    passed = True
+    for name, encoder in candidates.items():
+        report = check_parity(reference, encoder, texts, index=vector_search.index)
+        print(f"{name}: mean cosine {report['mean_cosine']:.4f}, "
+              f"min cosine {report['min_cosine']:.4f}, "
+              f"top-10 overlap {report['top10_overlap']:.1%}")
+        if report['min_cosine'] < ONNX_PARITY_MIN_COSINE:
+            print(f"   ❌ below ONNX_PARITY_MIN_COSINE ({ONNX_PARITY_MIN_COSINE})")
+            passed = False
+
+    print("\nLATENCY (single query encode)")
+    print("=============================")
+    latency = compare_latency({'torch': reference, **candidates}, SAMPLE_QUERIES)
+    for name, ms in latency.items():
+        print(f"{name}: {ms:.2f} ms/query ({latency['torch'] / ms:.1f}x vs torch)")
+
+    if not passed:
+        sys.exit(1)
+    print("\n✅ Set ENCODER_BACKEND = 'onnx' in config.py to use the exported encoder")
+
+if __name__ == "__main__":
+    main()
@@ -11,4 +11,7 @@ setup(
         "sentence-transformers",
         "tqdm",
     ],
+    extras_require={
+        "onnx": ["onnx", "onnxruntime"],
+    },
 ) 
\ No newline at end of file
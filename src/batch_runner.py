@@ -0,0 +1,202 @@
+import os
+import sys
+import json
+import math
+import threading
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+import numpy as np
+from src.config import BATCH_WORKERS, BATCH_SIZE
+from src.db.query_executor import ThreadBudget
+from src.db.hybrid_search import HybridSearch
+
+GRAPH_QUERY_TYPES = ("actor_genre", "director_rating", "actor_collaboration")
+ENCODED_QUERY_TYPES = ("vector", "text")
+
+
+def _clean(value):
+    """Make search results JSON-safe (NumPy scalars, NaN years)."""
+    if isinstance(value, dict):
+        return {k: _clean(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_clean(v) for v in value]
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and math.isnan(value):
+        return None
+    return value
+
+
+def _parse(line_number, line):
+    """Parse one input line into a query dict (plain text lines are text queries)."""
+    line = line.strip()
+    if not line:
+        return None
+    if line.startswith('{'):
+        query = json.loads(line)
+    else:
+        query = {"type": "text", "query": line}
+    query.setdefault("id", line_number)
+    return query
+
+
+def _validate(query):
+    """Why the query can't run, or None.
+
+    Checked before a query joins an encoder batch, so a bad line gets its
+    own error instead of failing the whole batch.
+    """
+    if query.get("type") in ENCODED_QUERY_TYPES + ("hybrid",):
+        text = query.get("query")
+        if not isinstance(text, str) or not text.strip():
+            return "query must be a non-empty string"
+    if query.get("type") == "autocomplete" and not isinstance(query.get("prefix"), str):
+        return "prefix must be a string"
+    if "top_k" in query:
+        top_k = query["top_k"]
+        if isinstance(top_k, bool) or not isinstance(top_k, int) or top_k < 1:
+            return "top_k must be a positive integer"
+    return None
+
+
+class BatchRunner:
+    """Run queries of every search type in parallel and stream results as JSONL.
+
+    Input is one query per line, either JSON such as
+    {"type": "actor_genre", "actor": "Tom Hanks", "genre": "Drama"} or
+    {"type": "vector", "query": "space adventure", "top_k": 5}, or plain
+    text which is treated as a natural language ("text") query. Text and
+    vector queries are grouped so the encoder runs on whole batches; graph
+    queries run concurrently on the thread pool. Name autocompletion
+    ({"type": "autocomplete", "prefix": "tom h", "kind": "actor"}) is answered
+    inline from the in-memory name index, and facet queries
+    ({"type": "facet", "genre": "Drama", "decade": 1990}) from the
+    materialized FacetStore. Hybrid queries
+    ({"type": "hybrid", "query": "heist", "director": "Christopher Nolan"})
+    run one by one on the pool, since each has its own candidate set.
+    Lines that aren't valid queries get an error line of their own.
+    Output lines carry the
+    query id (its line number unless given) and are written as soon as
+    their batch completes, so they may be out of input order. At most a few
+    tasks per worker are in flight, so arbitrarily long inputs stream
+    through in constant memory.
+    """
+
+    def __init__(self, graph_db, vector_search, text_search, facets=None,
+                 workers=BATCH_WORKERS, batch_size=BATCH_SIZE, top_k=10):
+        self.graph_db = graph_db
+        self.vector_search = vector_search
+        self.text_search = text_search
+        self.facets = facets
+        self.hybrid_search = HybridSearch(graph_db, vector_search)
+        self.workers = workers
+        self.batch_size = batch_size
+        self.top_k = top_k
+        self._write_lock = threading.Lock()
+
+    def _graph_query(self, query):
+        params = {k: v for k, v in query.items() if k not in ("id", "type", "top_k")}
+        results = self.graph_db.search(query["type"], params)
+        return [(query, results[:query.get("top_k", self.top_k)])]
+
+    def _hybrid_query(self, query):
+        filters = {k: query[k] for k in HybridSearch.FILTERS if k in query}
+        results = self.hybrid_search.search(query["query"], filters, top_k=query.get("top_k", self.top_k))
+        return [(query, results)]
+
+    def _encoded_batch(self, query_type, queries, top_k):
+        texts = [q["query"] for q in queries]
+        if query_type == "vector":
+            batch_results = self.vector_search.search_batch(texts, top_k=top_k)
+        else:
+            batch_results = self.text_search.search_batch(texts, top_k=top_k)
+        return list(zip(queries, batch_results))
+
+    def _write(self, out, query, results=None, error=None):
+        record = {"id": query.get("id"), "type": query.get("type")}
+        if error is not None:
+            record["error"] = error
+        else:
+            record["results"] = results
+        with self._write_lock:
+            out.write(json.dumps(_clean(record)) + "\n")
+            out.flush()
+
+    def run(self, lines, out=sys.stdout):
+        """Run every query in lines, writing one JSON result per query to out. Returns the count."""
+        count = 0
+        workers = self.workers or os.cpu_count() or 1
+        budget = ThreadBudget(workers, encoder=self.vector_search.encoder)
+        with budget as initializer, ThreadPoolExecutor(max_workers=workers, initializer=initializer) as pool:
+            max_in_flight = 4 * workers
+            futures = {}
+            # Encoded queries are grouped by (type, top_k) into encoder batches
+            pending = {}
+            
+            def drain(wait_for=None):
+                """Write out finished tasks, blocking until at least one is done if asked."""
+                done, _ = wait(futures, timeout=None if wait_for else 0, return_when=FIRST_COMPLETED)
+                for future in done:
+                    queries = futures.pop(future)
+                    try:
+                        for query, results in future.result():
+                            self._write(out, query, results)
+                    except Exception as e:
+                        for query in queries:
+                            self._write(out, query, error=str(e))
+            
+            def submit(fn, *args, queries):
+                while len(futures) >= max_in_flight:
+                    drain(wait_for=True)
+                futures[pool.submit(fn, *args)] = queries
+                drain()
+            
+            def flush(key):
+                batch = pending.pop(key, [])
+                if batch:
+                    submit(self._encoded_batch, key[0], batch, key[1], queries=batch)
+            
+            for line_number, line in enumerate(lines, 1):
+                try:
+                    query = _parse(line_number, line)
+                except json.JSONDecodeError as e:
+                    self._write(out, {"id": line_number}, error=f"Invalid JSON: {e}")
+                    count += 1
+                    continue
+                if query is None:
+                    continue
+                count += 1
+                
+                query_type = query.get("type")
+                error = _validate(query)
+                if error is not None:
+                    self._write(out, query, error=error)
+                elif query_type in GRAPH_QUERY_TYPES:
+                    submit(self._graph_query, query, queries=[query])
+                elif query_type == "hybrid":
+                    submit(self._hybrid_query, query, queries=[query])
+                elif query_type == "autocomplete":
+                    results = self.graph_db.autocomplete(
+                        query["prefix"], query.get("kind", "actor"), query.get("top_k", self.top_k)
+                    )
+                    self._write(out, query, results)
+                elif query_type == "facet" and self.facets is not None:
+                    filters = {k: v for k, v in query.items() if k not in ("id", "type", "top_k")}
+                    try:
+                        results = {"count": self.facets.count(**filters),
+                                   "top": self.facets.top(query.get("top_k", self.top_k), **filters)}
+                        self._write(out, query, results)
+                    except ValueError as e:
+                        self._write(out, query, error=str(e))
+                elif query_type in ENCODED_QUERY_TYPES:
+                    key = (query_type, query.get("top_k", self.top_k))
+                    pending.setdefault(key, []).append(query)
+                    if len(pending[key]) >= self.batch_size:
+                        flush(key)
+                else:
+                    self._write(out, query, error=f"Unsupported or incomplete query: {query_type}")
+            
+            for key in list(pending):
+                flush(key)
+            while futures:
+                drain(wait_for=True)
+        return count
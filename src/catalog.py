@@ -0,0 +1,23 @@
+from src.db.facets import FacetStore
+
+def refresh_facets(df):
+    """Rematerialize the facet aggregates for the current catalog."""
+    facets = FacetStore.materialize(df)
+    facets.save()
+    return facets
+
+def upsert_movies(df, graph_db, vector_search):
+    """Apply new and changed movies to both stores without a full rebuild."""
+    counts = graph_db.upsert_movies(df)
+    counts['encoded'] = vector_search.upsert_movies(df)
+    if vector_search.df is not None:
+        refresh_facets(vector_search.df)
+    return counts
+
+def delete_movies(titles, graph_db, vector_search):
+    """Remove movies from both stores without a full rebuild."""
+    deleted = graph_db.delete_movies(titles)
+    vector_search.delete_movies(titles)
+    if vector_search.df is not None:
+        refresh_facets(vector_search.df)
+    return deleted
@@ -28,4 +28,63 @@ EMBEDDINGS_INDEX_PATH = "data/movie_embeddings.index"
 INDEX_TO_MOVIE_PATH = 'data/index_to_movie.pkl'
 
 # Model configuration
-MODEL_NAME = 'all-MiniLM-L6-v2' 
\ No newline at end of file
+MODEL_NAME = 'all-MiniLM-L6-v2' 
+# Embedding encoding configuration
+# Set ENCODE_WORKERS > 1 to encode with a process pool (0 or 1 encodes in-process)
+ENCODE_WORKERS = 0
+ENCODE_BATCH_SIZE = 32
+ENCODE_CHUNK_SIZE = 256  # Texts per task handed to a worker
+ENCODE_THREADS_PER_WORKER = None  # None splits the available cores evenly between workers
+ENCODE_CHECKPOINT_DIR = 'data/encode_checkpoint'
+
+# Query encoder backend: 'torch' (SentenceTransformer) or 'onnx' (exported model run by onnxruntime)
+ENCODER_BACKEND = 'torch'
+ONNX_MODEL_DIR = 'data/onnx_encoder'
+ONNX_QUANTIZED = True  # Use the dynamically quantized int8 export
+ONNX_PARITY_MIN_COSINE = 0.99
+
+# Sharded vector index: NUM_SHARDS > 1 splits the index across worker processes
+NUM_SHARDS = 0
+SHARD_STRATEGY = 'hash'  # 'hash' (id modulo shard count) or 'range' (contiguous id ranges)
+SHARDS_DIR = 'data/shards'
+SHARD_THREADS = None  # FAISS threads per shard worker, None splits the available cores evenly
+
+# Natural language search reranking
+# Each candidate scores sum(weight * feature); rating, votes (log scale) and year are scaled to 0-1
+RERANK_WEIGHTS = {
+    'similarity': 1.0,
+    'genre': 0.2,  # Candidate is in one of the genres mentioned in the query, above 2.0 every match ranks first
+    'rating': 0.0,
+    'votes': 0.0,
+    'recency': 0.0,
+}
+RERANK_OVERFETCH = 2  # Candidates fetched per requested result
+
+# Precomputed k-nearest-neighbor graph
+KNN_GRAPH_PATH = 'data/knn_graph.npz'
+KNN_K = 20
+KNN_CHUNK_SIZE = 1024  # Rows per matrix multiply
+
+# Versioned artifact bundles (index + mapping + data), published atomically
+BUNDLES_DIR = 'data/bundles'
+BUNDLES_KEEP = 3  # Older versions are garbage-collected on publish
+BUNDLE_POLL_SECONDS = 10  # How often a running service checks for a new bundle
+RELOAD_GRACE_SECONDS = 30  # How long a replaced sharded index keeps serving in-flight queries
+
+# Batch query mode (python3 main.py --batch)
+BATCH_WORKERS = None  # Threads running queries, None uses the number of cores
+BATCH_SIZE = 64  # Text/vector queries encoded together
+
+# Fuzzy actor/director/genre name resolution
+NAME_MAX_EDIT_RATIO = 0.25  # Max edit distance as a fraction of the name length (at least 1)
+NAME_CANDIDATES = 20  # Names sharing the most trigrams that get an edit-distance check
+
+# Materialized facet aggregates (counts and top-rated lists per genre/decade/director/certificate)
+FACETS_PATH = 'data/facets.pkl'
+FACET_TOP_N = 20  # Movies kept per facet value
+FACET_PAIRS = [('genre', 'decade'), ('genre', 'certificate'), ('director', 'genre')]
+
+# Concurrent query execution: thread budgets per request (None splits the cores between workers)
+QUERY_WORKERS = None  # None uses the number of cores
+FAISS_THREADS_PER_QUERY = None
+TORCH_THREADS_PER_QUERY = None
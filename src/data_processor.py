@@ -1,11 +1,18 @@
+import os
+import hashlib
 import pandas as pd
 import re
 from src.config import DATASET_PATH
 
-def load_and_clean_data():
+def movie_id(title):
+    """Stable 63-bit integer id for a movie, derived from its title."""
+    digest = hashlib.blake2b(str(title).encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') & ((1 << 63) - 1)
+
+def load_and_clean_data(path=DATASET_PATH):
     """Load and clean the movie dataset."""
     # Load the dataset
-    df = pd.read_csv(DATASET_PATH)
+    df = pd.read_csv(path)
     
     # Basic data cleaning
     df = df.fillna('')
@@ -18,6 +25,9 @@ def load_and_clean_data():
     # Convert Released_Year to numeric
     df['Released_Year'] = pd.to_numeric(df['Released_Year'], errors='coerce')
     
+    # Stable id used by the vector index, survives reordering and catalog updates
+    df['Movie_ID'] = df['Series_Title'].apply(movie_id).astype('int64')
+    
     # Prepare text for embedding
     df['text_for_embedding'] = df.apply(
         lambda row: f"{row['Series_Title']} {row['Overview']} {row['Genre']} "
@@ -25,4 +35,26 @@ def load_and_clean_data():
         axis=1
     )
     
-    return df 
\ No newline at end of file
+    return df
+
+def update_dataset(upsert_path=None, deleted_titles=None, path=DATASET_PATH):
+    """Apply a catalog delta to the raw dataset CSV.
+
+    Rows in upsert_path replace rows with the same Series_Title (or are
+    appended), titles in deleted_titles are dropped. The file is replaced
+    atomically so readers never see a partial write.
+    """
+    df = pd.read_csv(path)
+    drop_titles = set(deleted_titles or [])
+    delta = None
+    if upsert_path:
+        delta = pd.read_csv(upsert_path)
+        drop_titles.update(delta['Series_Title'])
+    
+    df = df[~df['Series_Title'].isin(drop_titles)]
+    if delta is not None:
+        df = pd.concat([df, delta[df.columns.intersection(delta.columns)]], ignore_index=True)
+    
+    tmp_path = path + '.tmp'
+    df.to_csv(tmp_path, index=False)
+    os.replace(tmp_path, path)
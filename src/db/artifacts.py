@@ -0,0 +1,186 @@
+import os
+import json
+import time
+import uuid
+from datetime import datetime
+import shutil
+import pickle
+import hashlib
+import faiss
+import pandas as pd
+from src.config import BUNDLES_DIR, BUNDLES_KEEP, MODEL_NAME
+from src.db.sharded_index import ShardedIndex
+
+MANIFEST_FILE = 'manifest.json'
+CURRENT_FILE = 'CURRENT'
+INDEX_FILE = 'movie_embeddings.index'
+MAPPING_FILE = 'index_to_movie.pkl'
+DATA_FILE = 'movies.pkl'
+SHARDS_SUBDIR = 'shards'
+TMP_PREFIX = '.tmp-'
+
+
+def _sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _checksums(bundle_dir):
+    """sha256 of every file in a bundle, keyed by path relative to the bundle."""
+    checksums = {}
+    for dirpath, _, filenames in os.walk(bundle_dir):
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            rel_path = os.path.relpath(path, bundle_dir)
+            if rel_path != MANIFEST_FILE:
+                checksums[rel_path] = _sha256(path)
+    return checksums
+
+
+def index_checksum(files):
+    """One sha256 over the index file(s) of a bundle, from its manifest checksums.
+
+    It identifies the vectors themselves: bundles that only change movie
+    data share it, so artifacts derived from the vectors (the neighbor
+    table) stay valid across them.
+    """
+    digest = hashlib.sha256()
+    for rel_path in sorted(files):
+        if rel_path == INDEX_FILE or rel_path.startswith(SHARDS_SUBDIR + os.sep):
+            digest.update(f'{rel_path}:{files[rel_path]}\n'.encode())
+    return digest.hexdigest()
+
+
+class Bundle:
+    """A loaded artifact bundle."""
+
+    def __init__(self, version, index, index_to_movie, df, index_checksum=None):
+        self.version = version
+        self.index = index
+        self.index_to_movie = index_to_movie
+        self.df = df
+        self.index_checksum = index_checksum
+
+
+class ArtifactStore:
+    """Versioned, checksummed bundles of the vector index, id mapping and movie data.
+
+    Each publish writes a complete bundle into a temporary directory, renames
+    it into place and then atomically repoints the CURRENT file, so readers
+    always see either the old or the new bundle and never a partial one.
+    """
+
+    def __init__(self, root=BUNDLES_DIR):
+        self.root = root
+
+    def path(self, version):
+        return os.path.join(self.root, version)
+
+    def versions(self):
+        """Published versions, oldest first."""
+        if not os.path.isdir(self.root):
+            return []
+        return sorted(
+            name for name in os.listdir(self.root)
+            if not name.startswith(TMP_PREFIX)
+            and os.path.exists(os.path.join(self.root, name, MANIFEST_FILE))
+        )
+
+    def current_version(self):
+        try:
+            with open(os.path.join(self.root, CURRENT_FILE)) as f:
+                return f.read().strip() or None
+        except FileNotFoundError:
+            return None
+
+    def _set_current(self, version):
+        tmp_path = os.path.join(self.root, CURRENT_FILE + '.tmp')
+        with open(tmp_path, 'w') as f:
+            f.write(version)
+        os.replace(tmp_path, os.path.join(self.root, CURRENT_FILE))
+
+    def publish(self, index, index_to_movie, df):
+        """Write a new bundle, make it current and garbage-collect old ones. Returns its version."""
+        if df is None:
+            raise ValueError("A bundle needs the movie data that goes with the index")
+        os.makedirs(self.root, exist_ok=True)
+        version = datetime.now().strftime('%Y%m%dT%H%M%S%f') + '-' + uuid.uuid4().hex[:6]
+        tmp_dir = os.path.join(self.root, TMP_PREFIX + version)
+        os.makedirs(tmp_dir)
+
+        try:
+            sharded = isinstance(index, ShardedIndex)
+            if sharded:
+                index.save(os.path.join(tmp_dir, SHARDS_SUBDIR))
+            else:
+                faiss.write_index(index, os.path.join(tmp_dir, INDEX_FILE))
+            with open(os.path.join(tmp_dir, MAPPING_FILE), 'wb') as f:
+                pickle.dump(index_to_movie, f)
+            df.to_pickle(os.path.join(tmp_dir, DATA_FILE))
+
+            files = _checksums(tmp_dir)
+            manifest = {
+                'version': version,
+                'created': time.time(),
+                'model_name': MODEL_NAME,
+                'num_movies': len(index_to_movie),
+                'sharded': sharded,
+                'files': files,
+                'index_checksum': index_checksum(files),
+            }
+            with open(os.path.join(tmp_dir, MANIFEST_FILE), 'w') as f:
+                json.dump(manifest, f, indent=2)
+
+            os.rename(tmp_dir, self.path(version))
+        except Exception:
+            shutil.rmtree(tmp_dir, ignore_errors=True)
+            raise
+
+        self._set_current(version)
+        self.gc()
+        return version
+
+    def manifest(self, version):
+        with open(os.path.join(self.path(version), MANIFEST_FILE)) as f:
+            return json.load(f)
+
+    def verify(self, version):
+        """Raise ValueError if any file in the bundle doesn't match its checksum."""
+        expected = self.manifest(version)['files']
+        actual = _checksums(self.path(version))
+        if actual != expected:
+            bad = sorted(set(expected) ^ set(actual) |
+                         {p for p in expected if p in actual and expected[p] != actual[p]})
+            raise ValueError(f"Bundle {version} failed checksum verification: {', '.join(bad)}")
+
+    def load(self, version=None, verify=True):
+        """Load a bundle (default: the current one). Returns None if nothing was published."""
+        version = version or self.current_version()
+        if version is None:
+            return None
+        if verify:
+            self.verify(version)
+
+        bundle_dir = self.path(version)
+        manifest = self.manifest(version)
+        if manifest['sharded']:
+            index = ShardedIndex(os.path.join(bundle_dir, SHARDS_SUBDIR))
+        else:
+            index = faiss.read_index(os.path.join(bundle_dir, INDEX_FILE))
+        with open(os.path.join(bundle_dir, MAPPING_FILE), 'rb') as f:
+            index_to_movie = pickle.load(f)
+        data_path = os.path.join(bundle_dir, DATA_FILE)
+        df = pd.read_pickle(data_path) if os.path.exists(data_path) else None
+        checksum = manifest.get('index_checksum') or index_checksum(manifest['files'])
+        return Bundle(version, index, index_to_movie, df, checksum)
+
+    def gc(self, keep=BUNDLES_KEEP):
+        """Delete all but the newest `keep` versions, never the current one."""
+        current = self.current_version()
+        versions = self.versions()
+        for version in versions[:max(0, len(versions) - keep)]:
+            if version != current:
+                shutil.rmtree(self.path(version), ignore_errors=True)
@@ -0,0 +1,150 @@
+import os
+import json
+import shutil
+import hashlib
+import tempfile
+import multiprocessing as mp
+import numpy as np
+from tqdm import tqdm
+from src.config import (
+    MODEL_NAME, ENCODE_BATCH_SIZE, ENCODE_CHUNK_SIZE,
+    ENCODE_THREADS_PER_WORKER, ENCODE_CHECKPOINT_DIR
+)
+
+BUFFER_FILE = 'embeddings.f32'
+DONE_FILE = 'done.npy'
+META_FILE = 'meta.json'
+
+# Per-process state, set up once by _init_worker in each pool process
+_worker_model = None
+_worker_buffer = None
+
+
+def _init_worker(buffer_path, shape, threads):
+    """Load the model in a pool process and attach to the shared output buffer."""
+    global _worker_model, _worker_buffer
+    # Cap intra-op threads before torch is imported so workers don't oversubscribe cores
+    for var in ('OMP_NUM_THREADS', 'MKL_NUM_THREADS', 'OPENBLAS_NUM_THREADS'):
+        os.environ[var] = str(threads)
+    os.environ['TOKENIZERS_PARALLELISM'] = 'false'
+
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    torch.set_num_threads(threads)
+    _worker_model = SentenceTransformer(MODEL_NAME, device='cpu')
+    _worker_buffer = np.memmap(buffer_path, dtype='float32', mode='r+', shape=shape)
+
+
+def _encode_chunk(task):
+    """Encode one length-bucketed chunk and write it straight into the shared buffer."""
+    chunk_id, positions, texts, batch_size = task
+    embeddings = _worker_model.encode(
+        texts, batch_size=batch_size, show_progress_bar=False, convert_to_numpy=True
+    )
+    _worker_buffer[positions] = embeddings
+    _worker_buffer.flush()
+    return chunk_id
+
+
+def _fingerprint(texts, dimension, chunk_size):
+    """Identify an encoding job so a checkpoint is only resumed for the same input."""
+    digest = hashlib.sha256(f"{MODEL_NAME}|{dimension}|{chunk_size}".encode('utf-8'))
+    for text in texts:
+        digest.update(text.encode('utf-8'))
+        digest.update(b'\0')
+    return digest.hexdigest()
+
+
+def _save_done(checkpoint_dir, done):
+    """Atomically persist the completed-chunk mask."""
+    tmp_path = os.path.join(checkpoint_dir, DONE_FILE + '.tmp')
+    with open(tmp_path, 'wb') as f:
+        np.save(f, done)
+    os.replace(tmp_path, os.path.join(checkpoint_dir, DONE_FILE))
+
+
+def _open_checkpoint(checkpoint_dir, fingerprint, shape, num_chunks):
+    """Open (or create) the checkpoint buffer and return it with the completed-chunk mask."""
+    os.makedirs(checkpoint_dir, exist_ok=True)
+    buffer_path = os.path.join(checkpoint_dir, BUFFER_FILE)
+    meta_path = os.path.join(checkpoint_dir, META_FILE)
+    done_path = os.path.join(checkpoint_dir, DONE_FILE)
+
+    meta = None
+    if os.path.exists(meta_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+    if meta and meta.get('fingerprint') == fingerprint and os.path.exists(done_path) \
+            and os.path.exists(buffer_path):
+        done = np.load(done_path)
+        print(f"Resuming encoding from checkpoint: {int(done.sum())}/{num_chunks} chunks already done")
+        return buffer_path, done
+
+    # Stale or missing checkpoint, start over with a fresh preallocated buffer
+    buffer = np.memmap(buffer_path, dtype='float32', mode='w+', shape=shape)
+    buffer.flush()
+    del buffer
+    done = np.zeros(num_chunks, dtype=bool)
+    _save_done(checkpoint_dir, done)
+    with open(meta_path, 'w') as f:
+        json.dump({'fingerprint': fingerprint, 'shape': list(shape)}, f)
+    return buffer_path, done
+
+
+def encode_parallel(texts, dimension, num_workers=None, batch_size=ENCODE_BATCH_SIZE,
+                    chunk_size=ENCODE_CHUNK_SIZE, threads_per_worker=ENCODE_THREADS_PER_WORKER,
+                    checkpoint_dir=ENCODE_CHECKPOINT_DIR):
+    """Encode texts with a process pool, bucketing by length to minimise padding.
+
+    Texts are sorted by length and cut into chunks so every batch a worker
+    encodes holds similarly sized inputs. Workers write their vectors into a
+    preallocated memory-mapped buffer at the texts' original positions, and
+    completed chunks are recorded so an interrupted run picks up where it
+    stopped when called again with the same texts. Pass checkpoint_dir=None
+    to use a throwaway buffer instead.
+    """
+    n = len(texts)
+    shape = (n, dimension)
+    if n == 0:
+        return np.zeros(shape, dtype='float32')
+
+    cpu_count = os.cpu_count() or 1
+    num_workers = max(1, min(num_workers or cpu_count, cpu_count))
+    threads = threads_per_worker or max(1, cpu_count // num_workers)
+
+    # Length bucketing: neighbouring texts in `order` have similar lengths
+    lengths = np.fromiter((len(t) for t in texts), dtype=np.int64, count=n)
+    order = np.argsort(lengths, kind='stable')
+    chunks = [order[start:start + chunk_size] for start in range(0, n, chunk_size)]
+
+    temporary = checkpoint_dir is None
+    if temporary:
+        checkpoint_dir = tempfile.mkdtemp(prefix='encode_')
+    fingerprint = _fingerprint(texts, dimension, chunk_size)
+    buffer_path, done = _open_checkpoint(checkpoint_dir, fingerprint, shape, len(chunks))
+
+    # Longest chunks first so the slowest tasks don't end up at the tail
+    pending = [i for i in reversed(range(len(chunks))) if not done[i]]
+    tasks = (
+        (i, chunks[i], [texts[p] for p in chunks[i]], batch_size)
+        for i in pending
+    )
+
+    if pending:
+        ctx = mp.get_context('spawn')
+        with ctx.Pool(num_workers, initializer=_init_worker,
+                      initargs=(buffer_path, shape, threads)) as pool:
+            for chunk_id in tqdm(pool.imap_unordered(_encode_chunk, tasks),
+                                 total=len(pending), desc="Encoding"):
+                done[chunk_id] = True
+                _save_done(checkpoint_dir, done)
+
+    buffer = np.memmap(buffer_path, dtype='float32', mode='r', shape=shape)
+    embeddings = np.array(buffer)
+    del buffer
+
+    # The job finished, so the checkpoint has nothing left to resume
+    shutil.rmtree(checkpoint_dir, ignore_errors=True)
+    return embeddings
@@ -0,0 +1,228 @@
+import os
+import copy
+import json
+import time
+import threading
+import numpy as np
+from src.config import (
+    MODEL_NAME, ENCODER_BACKEND, ONNX_MODEL_DIR, ONNX_QUANTIZED, ENCODE_BATCH_SIZE
+)
+
+ONNX_FP32_FILE = 'model.onnx'
+ONNX_INT8_FILE = 'model_int8.onnx'
+ENCODER_CONFIG_FILE = 'encoder_config.json'
+
+
+class TorchEncoder:
+    """Reference query encoder running the SentenceTransformer PyTorch model.
+
+    Safe to call from several threads: fast tokenizers must not be used
+    concurrently, so tokenization is serialized while the forward passes
+    (which release the GIL) run in parallel.
+    """
+
+    def __init__(self, model=None):
+        if model is None:
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer(MODEL_NAME)
+        self.model = model
+        self._tokenize_lock = threading.Lock()
+
+    def encode(self, texts, batch_size=ENCODE_BATCH_SIZE):
+        import torch
+
+        # Encode in length order so each batch pads as little as possible
+        order = np.argsort([-len(t) for t in texts], kind='stable')
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            batch = [texts[i] for i in order[start:start + batch_size]]
+            with self._tokenize_lock:
+                features = self.model.tokenize(batch)
+            features = {k: v.to(self.model.device) for k, v in features.items()}
+            with torch.inference_mode():
+                embeddings = self.model(features)['sentence_embedding']
+            batches.append(embeddings.float().cpu().numpy())
+
+        if not batches:
+            return np.zeros((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        embeddings = np.empty((len(texts), batches[0].shape[1]), dtype=np.float32)
+        embeddings[order] = np.vstack(batches)
+        return embeddings
+
+
+class OnnxEncoder:
+    """Query encoder running an exported (optionally int8 quantized) model with onnxruntime.
+
+    Reproduces the SentenceTransformer pipeline for MODEL_NAME: tokenize,
+    transformer forward pass, attention-masked mean pooling and L2
+    normalization. Build the model files with export_onnx_model first.
+    onnxruntime sessions are thread-safe; each thread gets its own copy of
+    the tokenizer.
+    """
+
+    def __init__(self, model_dir=ONNX_MODEL_DIR, quantized=ONNX_QUANTIZED, num_threads=None):
+        try:
+            import onnxruntime as ort
+            from transformers import AutoTokenizer
+        except ImportError:
+            raise ImportError("The ONNX encoder backend needs onnxruntime: pip install onnxruntime")
+
+        model_path = os.path.join(model_dir, ONNX_INT8_FILE if quantized else ONNX_FP32_FILE)
+        if not os.path.exists(model_path):
+            raise FileNotFoundError(
+                f"ONNX model not found at {model_path}. Run scripts/export_onnx_encoder.py first."
+            )
+
+        self.model_path = model_path
+        self.num_threads = num_threads
+        self.session = self._create_session(num_threads)
+        self.input_names = {i.name for i in self.session.get_inputs()}
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self._local = threading.local()
+
+        with open(os.path.join(model_dir, ENCODER_CONFIG_FILE)) as f:
+            self.max_seq_length = json.load(f)['max_seq_length']
+
+    def _create_session(self, num_threads):
+        import onnxruntime as ort
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        return ort.InferenceSession(self.model_path, options, providers=['CPUExecutionProvider'])
+
+    def set_num_threads(self, num_threads):
+        """Use num_threads intra-op threads per query (None: all cores). Returns the previous value.
+
+        onnxruntime fixes the thread count when a session is created, so
+        this swaps in a new session; queries already running finish on the
+        old one.
+        """
+        previous = self.num_threads
+        if num_threads != previous:
+            self.session = self._create_session(num_threads)
+            self.num_threads = num_threads
+        return previous
+
+    def _tokenizer(self):
+        tokenizer = getattr(self._local, 'tokenizer', None)
+        if tokenizer is None:
+            tokenizer = self._local.tokenizer = copy.deepcopy(self.tokenizer)
+        return tokenizer
+
+    def encode(self, texts, batch_size=ENCODE_BATCH_SIZE):
+        batches = []
+        for start in range(0, len(texts), batch_size):
+            tokens = self._tokenizer()(
+                texts[start:start + batch_size], padding=True, truncation=True,
+                max_length=self.max_seq_length, return_tensors='np'
+            )
+            feeds = {k: v.astype(np.int64) for k, v in tokens.items() if k in self.input_names}
+            token_embeddings = self.session.run(None, feeds)[0]
+
+            # Mean pooling over real (non-padding) tokens, then normalize
+            mask = tokens['attention_mask'][..., None].astype(np.float32)
+            pooled = (token_embeddings * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+
+        if not batches:
+            return np.zeros((0, 0), dtype=np.float32)
+        return np.vstack(batches)
+
+
+def get_encoder(backend=None, model=None, num_threads=None):
+    """Create the query encoder for the configured backend.
+
+    `model` is an already loaded SentenceTransformer to reuse for the torch
+    backend. `num_threads` caps the ONNX session's intra-op threads; Torch's
+    thread count is process-wide (see ThreadBudget).
+    """
+    backend = backend or ENCODER_BACKEND
+    if backend == 'torch':
+        return TorchEncoder(model)
+    if backend == 'onnx':
+        return OnnxEncoder(num_threads=num_threads)
+    raise ValueError(f"Unknown encoder backend: {backend}")
+
+
+def export_onnx_model(model_dir=ONNX_MODEL_DIR, quantize=True):
+    """Export MODEL_NAME's transformer to ONNX and optionally quantize it to int8."""
+    import torch
+    from sentence_transformers import SentenceTransformer
+
+    os.makedirs(model_dir, exist_ok=True)
+    st_model = SentenceTransformer(MODEL_NAME, device='cpu')
+    transformer = st_model[0].auto_model.eval()
+    tokenizer = st_model.tokenizer
+    tokenizer.save_pretrained(model_dir)
+    with open(os.path.join(model_dir, ENCODER_CONFIG_FILE), 'w') as f:
+        json.dump({'model_name': MODEL_NAME, 'max_seq_length': st_model.max_seq_length}, f)
+
+    sample = tokenizer(["a sample movie description"], return_tensors='pt')
+    input_names = [name for name in ('input_ids', 'attention_mask', 'token_type_ids') if name in sample]
+
+    class _TokenEmbeddings(torch.nn.Module):
+        def __init__(self, model):
+            super().__init__()
+            self.model = model
+
+        def forward(self, *inputs):
+            return self.model(**dict(zip(input_names, inputs)))[0]
+
+    fp32_path = os.path.join(model_dir, ONNX_FP32_FILE)
+    dynamic_axes = {name: {0: 'batch', 1: 'sequence'} for name in input_names}
+    dynamic_axes['token_embeddings'] = {0: 'batch', 1: 'sequence'}
+    with torch.no_grad():
+        torch.onnx.export(
+            _TokenEmbeddings(transformer),
+            tuple(sample[name] for name in input_names),
+            fp32_path,
+            input_names=input_names,
+            output_names=['token_embeddings'],
+            dynamic_axes=dynamic_axes,
+            opset_version=14,
+        )
+
+    if quantize:
+        from onnxruntime.quantization import quantize_dynamic, QuantType
+        quantize_dynamic(fp32_path, os.path.join(model_dir, ONNX_INT8_FILE), weight_type=QuantType.QInt8)
+
+    return model_dir
+
+
+def check_parity(reference, candidate, texts, index=None, top_k=10):
+    """Compare a candidate encoder against the reference on the same texts.
+
+    Returns the mean and minimum cosine similarity between the two encoders'
+    vectors and, when a FAISS index is given, the mean overlap of their
+    top_k result sets.
+    """
+    ref = np.asarray(reference.encode(texts), dtype=np.float32)
+    cand = np.asarray(candidate.encode(texts), dtype=np.float32)
+    ref /= np.clip(np.linalg.norm(ref, axis=1, keepdims=True), 1e-12, None)
+    cand /= np.clip(np.linalg.norm(cand, axis=1, keepdims=True), 1e-12, None)
+    cosine = (ref * cand).sum(axis=1)
+
+    report = {'mean_cosine': float(cosine.mean()), 'min_cosine': float(cosine.min())}
+    if index is not None:
+        _, ref_ids = index.search(ref, top_k)
+        _, cand_ids = index.search(cand, top_k)
+        overlaps = [len(set(r) & set(c)) / top_k for r, c in zip(ref_ids, cand_ids)]
+        report[f'top{top_k}_overlap'] = float(np.mean(overlaps))
+    return report
+
+
+def compare_latency(encoders, queries, repeats=3):
+    """Measure single-query encode latency (ms/query) for each named encoder."""
+    report = {}
+    for name, encoder in encoders.items():
+        encoder.encode(queries[:1])  # Warm up
+        start = time.perf_counter()
+        for _ in range(repeats):
+            for query in queries:
+                encoder.encode([query])
+        elapsed = time.perf_counter() - start
+        report[name] = elapsed * 1000 / (repeats * len(queries))
+    return report
@@ -0,0 +1,138 @@
+import os
+import pickle
+import numpy as np
+import pandas as pd
+from src.config import FACETS_PATH, FACET_TOP_N, FACET_PAIRS
+
+FACETS = ('genre', 'decade', 'director', 'certificate')
+
+
+def _key(facet, value):
+    """Lookup key for a facet value: decades as ints ('1990s' -> 1990), names case-insensitive."""
+    if facet == 'decade':
+        return int(float(str(value).rstrip('s'))) // 10 * 10
+    return str(value).strip().lower()
+
+
+def _facet_frame(df):
+    """One row per movie with its facet values, best rated (then most voted) first."""
+    rating = pd.to_numeric(df['IMDB_Rating'], errors='coerce').fillna(0)
+    votes = pd.to_numeric(df['No_of_Votes'], errors='coerce').fillna(0)
+    year = pd.to_numeric(df['Released_Year'], errors='coerce')
+    frame = pd.DataFrame({
+        'row': np.arange(len(df)),
+        'rating': rating.to_numpy(),
+        'votes': votes.to_numpy(),
+        'genre': df['Genre'].map(lambda g: [x.strip() for x in str(g).split(',') if x.strip()]).to_numpy(),
+        'decade': (year // 10 * 10).to_numpy(),
+        'director': df['Director'].astype(str).str.strip().replace('', np.nan).to_numpy(),
+        'certificate': df['Certificate'].astype(str).str.strip().replace('', np.nan).to_numpy(),
+    })
+    frame = frame.sort_values(['rating', 'votes'], ascending=False, kind='stable')
+    return frame.explode('genre')
+
+
+def _materialize(frame, columns, top_n):
+    """Counts and top-rated rows for each value (tuple) of columns.
+
+    Returns (keys, display values, counts, top) where top is a (len(keys), top_n)
+    row array padded with -1.
+    """
+    # Exploding genres repeats other columns, so count movies not rows
+    valid = frame.dropna(subset=list(columns)).drop_duplicates(['row'] + list(columns))
+    groups = valid.groupby(list(columns), sort=False)['row']
+    keys, display, counts, top = [], [], [], []
+    for value, rows in groups:
+        value = value if isinstance(value, tuple) else (value,)
+        value = tuple(int(v) if facet == 'decade' else v for facet, v in zip(columns, value))
+        keys.append(tuple(_key(facet, v) for facet, v in zip(columns, value)))
+        display.append(value if len(value) > 1 else value[0])
+        counts.append(len(rows))
+        head = rows.to_numpy()[:top_n]
+        top.append(np.pad(head, (0, top_n - len(head)), constant_values=-1))
+    top = np.array(top, dtype=np.int32).reshape(len(keys), top_n)
+    return keys, display, np.array(counts, dtype=np.int32), top
+
+
+class FacetStore:
+    """Materialized facet aggregates over the catalog.
+
+    Built once per ingest: counts and the top-rated movies for every genre,
+    decade, director and certificate, plus the FACET_PAIRS combinations
+    (e.g. top-rated dramas of the 1990s). Everything is kept in compact
+    NumPy arrays indexed through dicts, so each request is a constant-time
+    lookup instead of an aggregation.
+    """
+
+    def __init__(self, titles, years, ratings, tables):
+        self.titles = titles
+        self.years = years
+        self.ratings = ratings
+        # tables maps a tuple of facet names to (key -> position, display values, counts, top rows)
+        self.tables = tables
+
+    @classmethod
+    def materialize(cls, df, top_n=FACET_TOP_N, pairs=FACET_PAIRS):
+        df = df.drop_duplicates('Series_Title').reset_index(drop=True)
+        frame = _facet_frame(df)
+
+        tables = {}
+        for columns in [(facet,) for facet in FACETS] + [tuple(pair) for pair in pairs]:
+            keys, display, counts, top = _materialize(frame, columns, top_n)
+            # Order values by count so listing a facet needs no sorting at query time
+            order = np.argsort(-counts, kind='stable')
+            tables[columns] = (
+                {keys[i]: position for position, i in enumerate(order)},
+                [display[i] for i in order],
+                counts[order],
+                top[order],
+            )
+
+        year = pd.to_numeric(df['Released_Year'], errors='coerce')
+        return cls(
+            df['Series_Title'].to_numpy(dtype=object),
+            year.fillna(0).to_numpy(dtype=np.int16),
+            pd.to_numeric(df['IMDB_Rating'], errors='coerce').fillna(0).to_numpy(dtype=np.float32),
+            tables,
+        )
+
+    def _lookup(self, filters):
+        if not filters:
+            raise ValueError("At least one facet filter is needed")
+        for columns in (tuple(filters), tuple(reversed(list(filters)))):
+            if columns in self.tables:
+                key = tuple(_key(facet, filters[facet]) for facet in columns)
+                return self.tables[columns], self.tables[columns][0].get(key)
+        raise ValueError(f"Facet combination not materialized: {', '.join(filters)}")
+
+    def count(self, **filters):
+        """Number of movies matching the facet filters, e.g. count(genre='Drama', decade=1990)."""
+        (_, _, counts, _), position = self._lookup(filters)
+        return 0 if position is None else int(counts[position])
+
+    def top(self, limit=10, **filters):
+        """Top-rated movies matching the facet filters, e.g. top(genre='Drama', decade='1990s')."""
+        (_, _, _, top), position = self._lookup(filters)
+        if position is None:
+            return []
+        rows = top[position, :limit]
+        return [
+            {'title': self.titles[row], 'year': int(self.years[row]), 'rating': round(float(self.ratings[row]), 1)}
+            for row in rows[rows >= 0]
+        ]
+
+    def values(self, facet, limit=None):
+        """(value, count) pairs for a facet, most common first."""
+        _, display, counts, _ = self.tables[(facet,)]
+        return [(value, int(count)) for value, count in zip(display[:limit], counts[:limit])]
+
+    def save(self, path=FACETS_PATH):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self, f)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=FACETS_PATH):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
@@ -1,9 +1,15 @@
 from neo4j import GraphDatabase as Neo4jDriver
 from src.config import NEO4J_URI, NEO4J_USER, NEO4J_PASSWORD
+from src.db.name_index import NameIndex
 import pandas as pd
 
 class GraphDatabase:
-    def __init__(self):
+    # Search parameters that name an entity, and the NameIndex kind they resolve against
+    NAME_PARAMS = {"actor": "actor", "director": "director", "genre": "genre"}
+    
+    def __init__(self, name_index=None):
+        # Optional NameIndex used to correct typos/casing in names before querying
+        self.name_index = name_index
         self.driver = Neo4jDriver.driver(
             NEO4J_URI, 
             auth=(NEO4J_USER, NEO4J_PASSWORD),
@@ -37,11 +43,7 @@ class GraphDatabase:
     def add_movie(self, row):
         """Add a movie and its relationships to the graph database."""
         try:
-            # Pre-process row data to ensure all required fields are available
-            # Handle No_of_Votes specifically as it's causing issues
-            if 'No_of_votes' not in row or pd.isna(row['No_of_votes']) or row['No_of_votes'] == '':
-                row['No_of_votes'] = 0
-                
+            row = self._prepare_row(row)
             with self.driver.session() as session:
                 session.execute_write(self._add_movie_tx, row)
                 
@@ -49,10 +51,16 @@ class GraphDatabase:
             print(f"Error adding movie {row.get('Series_Title', 'Unknown')}: {str(e)}")
             # Continue with next movie
     
-    def _add_movie_tx(self, tx, row):
-        """Transaction function to add a movie and its relationships."""
-        # Create Movie node with safer conversions
-        movie_props = {
+    def _prepare_row(self, row):
+        """Pre-process row data to ensure all required fields are available."""
+        # Handle No_of_Votes specifically as it's causing issues
+        if 'No_of_votes' not in row or pd.isna(row['No_of_votes']) or row['No_of_votes'] == '':
+            row['No_of_votes'] = 0
+        return row
+    
+    def _movie_props(self, row):
+        """Build Movie node properties from a dataset row with safer conversions."""
+        return {
             "title": str(row['Series_Title']),
             "year": int(float(row['Released_Year'])) if row['Released_Year'] and str(row['Released_Year']).strip() and str(row['Released_Year']).strip().lower() != 'nan' else None,
             "rating": float(row['IMDB_Rating']) if row['IMDB_Rating'] and str(row['IMDB_Rating']).strip() and str(row['IMDB_Rating']).strip().lower() != 'nan' else None,
@@ -64,6 +72,20 @@ class GraphDatabase:
             "certificate": str(row['Certificate']) if row['Certificate'] else '',
             "poster_link": str(row['Poster_Link']) if row['Poster_Link'] else ''
         }
+    
+    def _movie_links(self, row):
+        """Director, actor and genre names a dataset row should be linked to."""
+        directors = [str(row['Director'])] if row['Director'] and str(row['Director']).strip() else []
+        actors = [str(row[f'Star{i}']) for i in range(1, 5) if row[f'Star{i}'] and str(row[f'Star{i}']).strip()]
+        genres = []
+        if row['Genre'] and str(row['Genre']).strip():
+            genres = [g.strip() for g in str(row['Genre']).split(',') if g.strip()]
+        return directors, actors, genres
+    
+    def _add_movie_tx(self, tx, row):
+        """Transaction function to add a movie and its relationships."""
+        # Create Movie node with safer conversions
+        movie_props = self._movie_props(row)
         
         # Create the movie node
         create_movie_query = """
@@ -110,13 +132,190 @@ class GraphDatabase:
                     """
                     tx.run(create_genre_query, name=genre_name, movie_title=str(row['Series_Title']))
     
+    def upsert_movies(self, df):
+        """Apply new and changed movies from df, leaving unchanged ones untouched.
+
+        Existing movies are diffed against their rows: properties are
+        overwritten and stale director, actor and genre relationships are
+        removed only when something changed. Returns counts of added,
+        updated and unchanged movies.
+        """
+        rows = [self._prepare_row(row.copy()) for _, row in df.iterrows()]
+        titles = [str(row['Series_Title']) for row in rows]
+        
+        with self.driver.session() as session:
+            existing = {
+                record['title']: record
+                for record in session.run("""
+                UNWIND $titles AS title
+                MATCH (m:Movie {title: title})
+                OPTIONAL MATCH (d:Person)-[:DIRECTED]->(m)
+                OPTIONAL MATCH (a:Person)-[:ACTED_IN]->(m)
+                OPTIONAL MATCH (m)-[:IN_GENRE]->(g:Genre)
+                RETURN m.title AS title, properties(m) AS props,
+                       collect(DISTINCT d.name) AS directors,
+                       collect(DISTINCT a.name) AS actors,
+                       collect(DISTINCT g.name) AS genres
+                """, titles=titles)
+            }
+            
+            counts = {'added': 0, 'updated': 0, 'unchanged': 0}
+            for row in rows:
+                props = self._movie_props(row)
+                directors, actors, genres = self._movie_links(row)
+                current = existing.get(props['title'])
+                
+                if current is None:
+                    session.execute_write(self._add_movie_tx, row)
+                    counts['added'] += 1
+                elif (all(current['props'].get(k) == v for k, v in props.items())
+                      and set(current['directors']) == set(directors)
+                      and set(current['actors']) == set(actors)
+                      and set(current['genres']) == set(genres)):
+                    counts['unchanged'] += 1
+                else:
+                    session.execute_write(self._update_movie_tx, row, props, directors, actors, genres)
+                    counts['updated'] += 1
+            
+            self._delete_orphans(session)
+        if counts['added'] or counts['updated']:
+            self.refresh_name_index()
+        return counts
+    
+    def _update_movie_tx(self, tx, row, props, directors, actors, genres):
+        """Transaction function to bring an existing movie in line with its row."""
+        title = props['title']
+        tx.run("MATCH (m:Movie {title: $title}) SET m += $props", title=title, props=props)
+        tx.run("""
+        MATCH (p:Person)-[r:DIRECTED]->(m:Movie {title: $title})
+        WHERE NOT p.name IN $names
+        DELETE r
+        """, title=title, names=directors)
+        tx.run("""
+        MATCH (m:Movie {title: $title})-[r:ACTED_IN|CAST]-(p:Person)
+        WHERE NOT p.name IN $names
+        DELETE r
+        """, title=title, names=actors)
+        tx.run("""
+        MATCH (m:Movie {title: $title})-[r:IN_GENRE|HAS_MOVIE]-(g:Genre)
+        WHERE NOT g.name IN $names
+        DELETE r
+        """, title=title, names=genres)
+        # Link any new directors, actors and genres
+        self._add_movie_tx(tx, row)
+    
+    def delete_movies(self, titles):
+        """Delete movies by title, plus people and genres left without movies."""
+        with self.driver.session() as session:
+            deleted = session.run("""
+            UNWIND $titles AS title
+            MATCH (m:Movie {title: title})
+            DETACH DELETE m
+            RETURN count(*) AS deleted
+            """, titles=[str(t) for t in titles]).single()['deleted']
+            self._delete_orphans(session)
+        if deleted:
+            self.refresh_name_index()
+        return deleted
+    
+    def _delete_orphans(self, session):
+        """Remove Person and Genre nodes no longer connected to any movie."""
+        session.run("MATCH (p:Person) WHERE NOT (p)--(:Movie) DETACH DELETE p")
+        session.run("MATCH (g:Genre) WHERE NOT (g)--(:Movie) DETACH DELETE g")
+    
+    def write_similar_edges(self, edges, batch_size=1000):
+        """Replace SIMILAR_TO relationships with (source title, target title, score) edges."""
+        with self.driver.session() as session:
+            session.run("MATCH ()-[r:SIMILAR_TO]->() DELETE r")
+            batch = []
+            for source, target, score in edges:
+                batch.append({"source": source, "target": target, "score": score})
+                if len(batch) >= batch_size:
+                    session.execute_write(self._write_similar_edges_tx, batch)
+                    batch = []
+            if batch:
+                session.execute_write(self._write_similar_edges_tx, batch)
+    
+    def _write_similar_edges_tx(self, tx, batch):
+        """Transaction function to write one batch of SIMILAR_TO relationships."""
+        tx.run("""
+        UNWIND $edges AS edge
+        MATCH (a:Movie {title: edge.source})
+        MATCH (b:Movie {title: edge.target})
+        MERGE (a)-[r:SIMILAR_TO]->(b)
+        SET r.score = edge.score
+        """, edges=batch)
+    
+    def refresh_name_index(self):
+        """Rebuild the name index from the people and genres currently in the graph."""
+        if self.name_index is None:
+            return
+        with self.driver.session() as session:
+            people = session.run("MATCH (p:Person) RETURN p.name AS name, p.role AS role").data()
+            genres = session.run("MATCH (g:Genre) RETURN g.name AS name").data()
+        self.name_index = NameIndex({
+            'actor': [p['name'] for p in people if p['role'] == 'Actor'],
+            'director': [p['name'] for p in people if p['role'] == 'Director'],
+            'genre': [g['name'] for g in genres],
+        })
+    
+    def resolve_names(self, params):
+        """Replace actor/director/genre names in params with their canonical spelling, if known.
+
+        Names in the index are kept (only their case/spacing is normalized),
+        unknown ones are fuzzy-matched. Call refresh_name_index after catalog
+        updates made by another process so new names are known here too.
+        """
+        if self.name_index is None:
+            return params
+        for key, kind in self.NAME_PARAMS.items():
+            if isinstance(params.get(key), str):
+                resolved = self.name_index.resolve(params[key], kind)
+                if resolved:
+                    params[key] = resolved
+        return params
+    
+    def autocomplete(self, prefix, kind, limit=10):
+        """Actor, director or genre names matching prefix (needs a name index)."""
+        if self.name_index is None:
+            return []
+        return self.name_index.autocomplete(prefix, kind, limit)
+    
+    def candidate_titles(self, filters):
+        """Titles of movies matching all given filters.
+
+        Supported filters: actor, director, genre and min_rating. Used to
+        narrow vector search to a graph-defined candidate set.
+        """
+        filters = {k: v.strip() if isinstance(v, str) else v
+                   for k, v in filters.items() if v not in (None, '')}
+        self.resolve_names(filters)
+        patterns = ["(m:Movie)"]
+        if 'actor' in filters:
+            patterns.append("(:Person {name: $actor, role: 'Actor'})-[:ACTED_IN]->(m)")
+        if 'director' in filters:
+            patterns.append("(:Person {name: $director, role: 'Director'})-[:DIRECTED]->(m)")
+        if 'genre' in filters:
+            patterns.append("(m)-[:IN_GENRE]->(:Genre {name: $genre})")
+        
+        cypher_query = "MATCH " + ", ".join(patterns)
+        if 'min_rating' in filters:
+            cypher_query += "\nWHERE m.rating >= $min_rating"
+        cypher_query += "\nRETURN DISTINCT m.title AS title"
+        
+        with self.driver.session() as session:
+            return [record['title'] for record in session.run(cypher_query, **filters)]
+    
     def search(self, query_type, params):
         """Execute graph-based searches in Neo4j."""
+        # Work on a copy so callers' (possibly shared) params are never modified
+        params = dict(params)
         with self.driver.session() as session:
             # Trim any input parameters that are strings to handle extra spaces
             for key in params:
                 if isinstance(params[key], str):
                     params[key] = params[key].strip()
+            self.resolve_names(params)
             
             if query_type == "actor_genre":
                 cypher_query = """
@@ -0,0 +1,29 @@
+from src.data_processor import movie_id
+
+
+class HybridSearch:
+    """Vector search restricted to movies that match graph filters.
+
+    The graph part of the query (e.g. director = "Christopher Nolan") is
+    resolved to a candidate set first, which is then pushed into the vector
+    search so only those movies are scored.
+    """
+
+    FILTERS = ("actor", "director", "genre", "min_rating")
+
+    def __init__(self, graph_db, vector_search):
+        self.graph_db = graph_db
+        self.vector_search = vector_search
+
+    def search(self, query, filters, top_k=10):
+        """Find movies matching filters (actor, director, genre, min_rating) most similar to query."""
+        filters = {k: v for k, v in (filters or {}).items()
+                   if k in self.FILTERS and v is not None and str(v).strip()}
+        if not filters:
+            # Every movie is a candidate, the index search is faster than scanning them all
+            return self.vector_search.search(query, top_k=top_k)
+        titles = self.graph_db.candidate_titles(filters)
+        if not titles:
+            return []
+        candidate_ids = [movie_id(title) for title in titles]
+        return self.vector_search.search(query, top_k=top_k, candidate_ids=candidate_ids)
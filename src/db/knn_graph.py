@@ -0,0 +1,105 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import numpy as np
+try:
+    from threadpoolctl import threadpool_limits
+except ImportError:
+    threadpool_limits = None
+from src.config import KNN_GRAPH_PATH, KNN_K, KNN_CHUNK_SIZE
+
+
+def build_knn_graph(ids, vectors, k=KNN_K, chunk_size=KNN_CHUNK_SIZE, num_threads=None,
+                    index_checksum=None):
+    """Exact all-pairs k-nearest neighbors over normalized vectors.
+
+    Rows are processed in chunks: each chunk is one matrix multiply against
+    the full matrix followed by an argpartition, and chunks run on a thread
+    pool (NumPy releases the GIL), so memory stays at chunk_size x n scores
+    per thread. The BLAS behind the matrix multiply is multithreaded too,
+    so with threadpoolctl installed its threads are capped to split the
+    cores between the workers; without it a single worker runs and BLAS
+    uses the cores. index_checksum identifies the index the vectors came
+    from. Returns a NeighborTable.
+    """
+    ids = np.asarray(ids, dtype=np.int64)
+    vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+    n = len(ids)
+    k = max(0, min(k, n - 1))
+    neighbor_ids = np.full((n, k), -1, dtype=np.int64)
+    neighbor_scores = np.zeros((n, k), dtype=np.float32)
+    if k == 0:
+        return NeighborTable(ids, neighbor_ids, neighbor_scores, index_checksum)
+
+    def process(start):
+        end = min(start + chunk_size, n)
+        scores = vectors[start:end] @ vectors.T
+        # A movie is not its own neighbor
+        local = np.arange(end - start)
+        scores[local, start + local] = -np.inf
+
+        top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(scores, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        neighbor_ids[start:end] = ids[top]
+        neighbor_scores[start:end] = np.take_along_axis(top_scores, order, axis=1)
+
+    cores = os.cpu_count() or 1
+    if threadpool_limits is None:
+        workers = num_threads or 1
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(process, range(0, n, chunk_size)))
+    else:
+        workers = num_threads or cores
+        with threadpool_limits(limits=max(1, cores // workers), user_api='blas'), \
+                ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(process, range(0, n, chunk_size)))
+
+    return NeighborTable(ids, neighbor_ids, neighbor_scores, index_checksum)
+
+
+class NeighborTable:
+    """Precomputed neighbors as fixed-size (n, k) id and score arrays.
+
+    index_checksum identifies the index the table was built from (see
+    artifacts.index_checksum), if known.
+    """
+
+    def __init__(self, ids, neighbor_ids, neighbor_scores, index_checksum=None):
+        self.ids = ids
+        self.neighbor_ids = neighbor_ids
+        self.neighbor_scores = neighbor_scores
+        self.index_checksum = index_checksum
+        self._rows = {int(movie_id): row for row, movie_id in enumerate(ids)}
+
+    @property
+    def k(self):
+        return self.neighbor_ids.shape[1]
+
+    def __contains__(self, movie_id):
+        return int(movie_id) in self._rows
+
+    def neighbors(self, movie_id, top_k=None):
+        """(scores, ids) of a movie's nearest neighbors, best first."""
+        row = self._rows[int(movie_id)]
+        return self.neighbor_scores[row, :top_k], self.neighbor_ids[row, :top_k]
+
+    def edges(self):
+        """Iterate (source id, target id, score) over every stored neighbor pair."""
+        for row, source in enumerate(self.ids):
+            for target, score in zip(self.neighbor_ids[row], self.neighbor_scores[row]):
+                if target >= 0:
+                    yield int(source), int(target), float(score)
+
+    def save(self, path=KNN_GRAPH_PATH):
+        tmp_path = path + '.tmp.npz'
+        extra = {} if self.index_checksum is None else {'index_checksum': np.array(self.index_checksum)}
+        np.savez(tmp_path, ids=self.ids, neighbor_ids=self.neighbor_ids,
+                 neighbor_scores=self.neighbor_scores, **extra)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=KNN_GRAPH_PATH):
+        with np.load(path) as data:
+            checksum = str(data['index_checksum']) if 'index_checksum' in data else None
+            return cls(data['ids'], data['neighbor_ids'], data['neighbor_scores'], checksum)
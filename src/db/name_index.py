@@ -0,0 +1,146 @@
+import bisect
+import unicodedata
+from collections import Counter, defaultdict
+from src.config import NAME_MAX_EDIT_RATIO, NAME_CANDIDATES
+
+KIND_COLUMNS = {
+    'actor': ['Star1', 'Star2', 'Star3', 'Star4'],
+    'director': ['Director'],
+}
+
+
+def normalize_name(name):
+    """Lowercase, strip accents and drop spaces/punctuation: 'Leonardo Di Caprio' -> 'leonardodicaprio'."""
+    decomposed = unicodedata.normalize('NFKD', str(name))
+    return ''.join(c for c in decomposed if c.isalnum()).lower()
+
+
+def _trigrams(key):
+    padded = f"^^{key}$"
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _edit_distance(a, b, limit):
+    """Levenshtein distance between a and b, or limit + 1 once it is known to exceed limit.
+
+    Only the diagonal band of width 2 * limit + 1 is computed.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    over = limit + 1
+    previous = [j if j <= limit else over for j in range(len(b) + 1)]
+    for i in range(1, len(a) + 1):
+        ca = a[i - 1]
+        low, high = max(1, i - limit), min(len(b), i + limit)
+        current = [over] * (len(b) + 1)
+        current[0] = i if i <= limit else over
+        best = current[0]
+        for j in range(low, high + 1):
+            cost = previous[j - 1] + (ca != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost
+            if cost < best:
+                best = cost
+        if best > limit:
+            return over
+        previous = current
+    return min(previous[-1], over)
+
+
+class NameIndex:
+    """In-memory index of actor, director and genre names for typo-tolerant lookup.
+
+    Names are matched on a normalized key, so case, accents and spacing
+    never matter. Anything else goes through a trigram inverted index to
+    pick a few candidates, which are then checked with a bounded edit
+    distance. Prefix autocomplete matches the start of the full name or of
+    any later word ("han" finds "Tom Hanks").
+    """
+
+    def __init__(self, names_by_kind):
+        self._exact = {}
+        self._keys = {}
+        self._grams = {}
+        self._prefixes = {}
+        for kind, names in names_by_kind.items():
+            exact = {}
+            for name in names:
+                name = str(name).strip()
+                key = normalize_name(name)
+                if key and key not in exact:
+                    exact[key] = name
+            keys = list(exact)
+            grams = defaultdict(list)
+            for position, key in enumerate(keys):
+                for gram in _trigrams(key):
+                    grams[gram].append(position)
+
+            prefixes = []
+            for key, name in exact.items():
+                words = [normalize_name(w) for w in name.split()]
+                for start in range(len(words)):
+                    suffix = ''.join(words[start:])
+                    if suffix:
+                        prefixes.append((suffix, name))
+            prefixes.sort()
+
+            self._exact[kind] = exact
+            self._keys[kind] = keys
+            self._grams[kind] = dict(grams)
+            self._prefixes[kind] = prefixes
+
+    @classmethod
+    def from_dataframe(cls, df):
+        """Build the index from the Director, Star1-4 and Genre columns."""
+        names = {kind: [n for col in cols for n in df[col] if str(n).strip()]
+                 for kind, cols in KIND_COLUMNS.items()}
+        names['genre'] = [g.strip() for genres in df['Genre'] for g in str(genres).split(',') if g.strip()]
+        return cls(names)
+
+    def resolve(self, name, kind):
+        """Canonical spelling of name for kind ('actor', 'director', 'genre'), or None if nothing is close."""
+        exact = self._exact.get(kind)
+        key = normalize_name(name)
+        if not exact or not key:
+            return None
+        if key in exact:
+            return exact[key]
+
+        # Candidates are the names sharing the most trigrams with the input
+        keys, grams = self._keys[kind], self._grams[kind]
+        key_grams = _trigrams(key)
+        overlap = Counter()
+        for gram in key_grams:
+            overlap.update(grams.get(gram, ()))
+
+        limit = max(1, int(len(key) * NAME_MAX_EDIT_RATIO))
+        # Each edit changes at most 3 trigrams, so fewer shared ones rule a name out
+        min_overlap = len(key_grams) - 3 * limit
+        best, best_distance = None, limit + 1
+        for position, shared in overlap.most_common(NAME_CANDIDATES):
+            if shared < min_overlap:
+                break
+            distance = _edit_distance(key, keys[position], best_distance - 1)
+            if distance < best_distance:
+                best, best_distance = keys[position], distance
+                if distance == 1:
+                    break
+        return exact[best] if best is not None else None
+
+    def autocomplete(self, prefix, kind, limit=10):
+        """Names of kind with a word starting with prefix, at most limit, alphabetical by match."""
+        entries = self._prefixes.get(kind, [])
+        key = normalize_name(prefix)
+        if not key:
+            return []
+        matches = []
+        position = bisect.bisect_left(entries, (key,))
+        while position < len(entries) and entries[position][0].startswith(key) and len(matches) < limit:
+            name = entries[position][1]
+            if name not in matches:
+                matches.append(name)
+            position += 1
+        return matches
@@ -0,0 +1,123 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+import faiss
+from src.db.hybrid_search import HybridSearch
+from src.config import QUERY_WORKERS, FAISS_THREADS_PER_QUERY, TORCH_THREADS_PER_QUERY
+
+
+class ThreadBudget:
+    """Split the cores between concurrent queries.
+
+    Without a budget every request asks FAISS (OpenMP) and the encoder for
+    all cores, so N concurrent requests start N x cores threads and
+    throughput collapses. Torch's intra-op thread count is process-wide and
+    the ONNX session's is per session, so apply() sets both (torch_threads)
+    and restore() puts the previous values back. FAISS's OpenMP thread count
+    is per calling thread and is set by initializer in each worker thread.
+    """
+
+    def __init__(self, workers, faiss_threads=FAISS_THREADS_PER_QUERY,
+                 torch_threads=TORCH_THREADS_PER_QUERY, encoder=None):
+        cores = os.cpu_count() or 1
+        self.faiss_threads = faiss_threads or max(1, cores // workers)
+        self.torch_threads = torch_threads or max(1, cores // workers)
+        self.encoder = encoder
+        self._saved_torch = None
+        self._saved_encoder = None
+
+    def apply(self):
+        """Set the encoder thread counts and return the per-thread initializer."""
+        try:
+            import torch
+            self._saved_torch = torch.get_num_threads()
+            torch.set_num_threads(self.torch_threads)
+        except ImportError:
+            pass
+        if hasattr(self.encoder, 'set_num_threads'):
+            self._saved_encoder = (self.encoder.set_num_threads(self.torch_threads),)
+        return self.initializer
+
+    def initializer(self):
+        faiss.omp_set_num_threads(self.faiss_threads)
+
+    def restore(self):
+        """Put back the thread counts that apply() replaced."""
+        if self._saved_torch is not None:
+            import torch
+            torch.set_num_threads(self._saved_torch)
+            self._saved_torch = None
+        if self._saved_encoder is not None:
+            self.encoder.set_num_threads(self._saved_encoder[0])
+            self._saved_encoder = None
+
+    def __enter__(self):
+        return self.apply()
+
+    def __exit__(self, *exc):
+        self.restore()
+
+
+class QueryExecutor:
+    """Run searches concurrently on a thread pool with explicit FAISS/Torch thread budgets.
+
+    The search objects are shared by all worker threads: VectorSearch
+    serves from an immutable snapshot and TextSearch builds fresh result
+    dicts, so queries never write shared state. The heavy work (Torch or
+    onnxruntime forward passes, FAISS searches, NumPy reranking) releases
+    the GIL, so throughput scales with the number of workers up to the
+    core count.
+    """
+
+    def __init__(self, vector_search, text_search=None, graph_db=None, workers=QUERY_WORKERS,
+                 faiss_threads=FAISS_THREADS_PER_QUERY, torch_threads=TORCH_THREADS_PER_QUERY):
+        self.vector_search = vector_search
+        self.text_search = text_search
+        self.graph_db = graph_db
+        self.hybrid_search = HybridSearch(graph_db, vector_search) if graph_db is not None else None
+        workers = workers or os.cpu_count() or 1
+        self.budget = ThreadBudget(workers, faiss_threads, torch_threads, encoder=vector_search.encoder)
+        self.pool = ThreadPoolExecutor(
+            max_workers=workers,
+            thread_name_prefix="query",
+            initializer=self.budget.apply(),
+        )
+        # Load before the first request so no query thread triggers the lazy load
+        vector_search.ensure_loaded()
+
+    def submit(self, query_type, *args, **kwargs):
+        """Run one search in the pool and return a Future with its results.
+
+        query_type is 'vector' (VectorSearch.search), 'similar'
+        (VectorSearch.similar_to), 'text' (TextSearch.search), 'hybrid'
+        (HybridSearch.search, needs graph_db) or one of the
+        GraphDatabase.search types.
+        """
+        if query_type == "vector":
+            fn = self.vector_search.search
+        elif query_type == "similar":
+            fn = self.vector_search.similar_to
+        elif query_type == "text" and self.text_search is not None:
+            fn = self.text_search.search
+        elif query_type == "hybrid" and self.hybrid_search is not None:
+            fn = self.hybrid_search.search
+        elif self.graph_db is not None and query_type in ("actor_genre", "director_rating",
+                                                          "actor_collaboration"):
+            return self.pool.submit(self.graph_db.search, query_type, *args, **kwargs)
+        else:
+            raise ValueError(f"Unsupported query type: {query_type}")
+        return self.pool.submit(fn, *args, **kwargs)
+
+    def map(self, query_type, queries, **kwargs):
+        """Run one search per query concurrently, returning results in input order."""
+        futures = [self.submit(query_type, query, **kwargs) for query in queries]
+        return [future.result() for future in futures]
+
+    def close(self):
+        self.pool.shutdown(wait=True)
+        self.budget.restore()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,81 @@
+import numpy as np
+import pandas as pd
+from src.config import RERANK_WEIGHTS
+
+
+def _scale(values):
+    """Min-max scale a float array to 0-1 (all zeros when constant)."""
+    low, high = values.min(), values.max()
+    if high <= low:
+        return np.zeros_like(values)
+    return (values - low) / (high - low)
+
+
+class Reranker:
+    """Score vector search candidates with NumPy using precomputed per-movie features.
+
+    Features are built once from the dataset: a genre membership matrix and
+    scaled IMDB rating, vote count and release year. Reranking a candidate
+    list is a handful of array operations plus one argpartition, so it stays
+    cheap when hundreds of candidates are overfetched.
+
+    The genre match is an additive boost, not a partition: a candidate
+    outside the mentioned genres still ranks first when its similarity
+    leads by more than the genre weight. Cosine similarities differ by at
+    most 2, so a genre weight above 2 puts every match before every
+    non-match.
+    """
+
+    def __init__(self, df, weights=None):
+        self.weights = {**RERANK_WEIGHTS, **(weights or {})}
+        df = df.drop_duplicates('Movie_ID')
+        self._rows = pd.Index(df['Movie_ID'])
+
+        genre_lists = df['Genre'].map(
+            lambda g: [name.strip() for name in str(g).split(',') if name.strip()]
+        )
+        self.genre_names = sorted({name for names in genre_lists for name in names})
+        self._genre_columns = {name: i for i, name in enumerate(self.genre_names)}
+
+        # One extra all-zero row for candidates that aren't in df (e.g. added after load)
+        n = len(df)
+        self._genres = np.zeros((n + 1, len(self.genre_names)), dtype=bool)
+        for row, names in enumerate(genre_lists):
+            self._genres[row, [self._genre_columns[name] for name in names]] = True
+
+        rating = pd.to_numeric(df['IMDB_Rating'], errors='coerce').fillna(0).to_numpy(dtype=np.float32)
+        votes = pd.to_numeric(df['No_of_Votes'], errors='coerce').fillna(0).to_numpy(dtype=np.float32)
+        year = pd.to_numeric(df['Released_Year'], errors='coerce')
+        year = year.fillna(year.min()).fillna(0).to_numpy(dtype=np.float32)
+        self._rating = np.append(_scale(rating), 0).astype(np.float32)
+        self._votes = np.append(_scale(np.log1p(votes)), 0).astype(np.float32)
+        self._recency = np.append(_scale(year), 0).astype(np.float32)
+
+    def score(self, similarities, ids, genres=None, weights=None):
+        """Combined score for each candidate under weights (default: the configured ones)."""
+        rows = self._rows.get_indexer(np.asarray(ids))
+        rows[rows < 0] = len(self._rating) - 1
+        w = self.weights if weights is None else {**self.weights, **weights}
+
+        scores = w['similarity'] * np.asarray(similarities, dtype=np.float32)
+        columns = [self._genre_columns[g] for g in (genres or []) if g in self._genre_columns]
+        if columns and w['genre']:
+            scores += w['genre'] * self._genres[np.ix_(rows, columns)].any(axis=1)
+        if w['rating']:
+            scores += w['rating'] * self._rating[rows]
+        if w['votes']:
+            scores += w['votes'] * self._votes[rows]
+        if w['recency']:
+            scores += w['recency'] * self._recency[rows]
+        return scores
+
+    def rerank(self, similarities, ids, genres=None, top_k=10, weights=None):
+        """Return the top_k (scores, ids) by combined score, best first."""
+        ids = np.asarray(ids)
+        scores = self.score(similarities, ids, genres, weights)
+        if len(scores) > top_k:
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return scores[top], ids[top]
@@ -0,0 +1,284 @@
+import os
+import json
+import threading
+import multiprocessing as mp
+import numpy as np
+import faiss
+from src.config import SHARD_THREADS
+
+MANIFEST_FILE = 'manifest.json'
+
+
+def _shard_path(shards_dir, shard):
+    return os.path.join(shards_dir, f'shard_{shard}.index')
+
+
+def assign_shards(ids, num_shards, strategy, bounds=None):
+    """Map each movie id to the shard that owns it."""
+    ids = np.asarray(ids, dtype=np.int64)
+    if strategy == 'hash':
+        return ids % num_shards
+    if strategy == 'range':
+        return np.searchsorted(np.asarray(bounds, dtype=np.int64), ids, side='right')
+    raise ValueError(f"Unknown shard strategy: {strategy}")
+
+
+def build_shards(embeddings, ids, shards_dir, num_shards, strategy='hash'):
+    """Split normalized embeddings into per-shard ID-mapped indexes and save them."""
+    ids = np.asarray(ids, dtype=np.int64)
+    bounds = None
+    if strategy == 'range':
+        # Shard boundaries at id quantiles so shards get roughly equal sizes
+        sorted_ids = np.sort(ids)
+        cuts = [len(ids) * s // num_shards for s in range(1, num_shards)]
+        bounds = [int(sorted_ids[c]) for c in cuts] if len(ids) else [0] * (num_shards - 1)
+
+    os.makedirs(shards_dir, exist_ok=True)
+    owners = assign_shards(ids, num_shards, strategy, bounds)
+    dimension = embeddings.shape[1]
+    for shard in range(num_shards):
+        mask = owners == shard
+        index = faiss.IndexIDMap2(faiss.IndexFlatIP(dimension))
+        if mask.any():
+            index.add_with_ids(np.ascontiguousarray(embeddings[mask]), ids[mask])
+        faiss.write_index(index, _shard_path(shards_dir, shard))
+
+    _write_manifest(shards_dir, num_shards, strategy, bounds, dimension)
+
+
+def _write_manifest(shards_dir, num_shards, strategy, bounds, dimension):
+    manifest = {
+        'num_shards': num_shards,
+        'strategy': strategy,
+        'bounds': bounds,
+        'dimension': dimension,
+    }
+    with open(os.path.join(shards_dir, MANIFEST_FILE), 'w') as f:
+        json.dump(manifest, f)
+
+
+def has_shards(shards_dir):
+    """Check whether a sharded index has been built in shards_dir."""
+    return os.path.exists(os.path.join(shards_dir, MANIFEST_FILE))
+
+
+def _serve_shard(conn, index_path, num_threads):
+    """Worker process loop: own one shard's index and answer commands over a pipe."""
+    faiss.omp_set_num_threads(num_threads)
+    index = faiss.read_index(index_path)
+    while True:
+        command, args = conn.recv()
+        try:
+            if command == 'search':
+                result = index.search(*args)
+            elif command == 'add':
+                index.add_with_ids(*args)
+                result = index.ntotal
+            elif command == 'remove':
+                result = index.remove_ids(args[0])
+            elif command == 'reconstruct':
+                result = np.vstack([index.reconstruct(int(key)) for key in args[0]])
+            elif command == 'dump':
+                result = (faiss.vector_to_array(index.id_map),
+                          index.index.reconstruct_n(0, index.ntotal))
+            elif command == 'ntotal':
+                result = index.ntotal
+            elif command == 'save':
+                faiss.write_index(index, args[0])
+                result = None
+            elif command == 'save_updated':
+                # Apply the changes to a copy so the live index keeps serving the old data
+                path, remove_ids, x, add_ids = args
+                updated = faiss.clone_index(index)
+                if len(remove_ids):
+                    updated.remove_ids(remove_ids)
+                if len(add_ids):
+                    updated.add_with_ids(x, add_ids)
+                faiss.write_index(updated, path)
+                result = updated.ntotal
+            elif command == 'close':
+                conn.send(('ok', None))
+                break
+            else:
+                raise ValueError(f"Unknown shard command: {command}")
+            conn.send(('ok', result))
+        except Exception as e:
+            conn.send(('error', f"{type(e).__name__}: {e}"))
+    conn.close()
+
+
+class ShardedIndex:
+    """A FAISS index split across worker processes, one per shard.
+
+    Exposes the parts of the FAISS index API that VectorSearch uses
+    (search, add_with_ids, remove_ids, ntotal) plus reconstruct_batch, so it can stand in for an
+    in-process index. Queries fan out to every shard in parallel and the
+    per-shard top-k lists are merged into a global top-k.
+    """
+
+    def __init__(self, shards_dir, num_threads=SHARD_THREADS):
+        with open(os.path.join(shards_dir, MANIFEST_FILE)) as f:
+            manifest = json.load(f)
+        self.num_shards = manifest['num_shards']
+        self.strategy = manifest['strategy']
+        self.bounds = manifest['bounds']
+        self.d = manifest['dimension']
+
+        if num_threads is None:
+            num_threads = max(1, (os.cpu_count() or 1) // self.num_shards)
+        self.num_threads = num_threads
+
+        ctx = mp.get_context('spawn')
+        self._conns = []
+        self._processes = []
+        for shard in range(self.num_shards):
+            parent_conn, child_conn = ctx.Pipe()
+            process = ctx.Process(
+                target=_serve_shard,
+                args=(child_conn, _shard_path(shards_dir, shard), num_threads),
+                daemon=True,
+            )
+            process.start()
+            child_conn.close()
+            self._conns.append(parent_conn)
+            self._processes.append(process)
+
+        # A pipe carries one request/response at a time, so each has its own lock
+        self._locks = [threading.Lock() for _ in range(self.num_shards)]
+
+    def _call(self, requests):
+        """Send {shard: (command, args)} to the shards, then collect {shard: result}.
+
+        Each shard's lock is held from its send to its receive, so calls
+        from several threads pipeline through the shards: one call can be
+        waiting on shard 1 while the next is already running on shard 0.
+        Locks are always taken in shard order, which rules out deadlocks.
+        """
+        shards = sorted(requests)
+        held = []
+        results = {}
+        errors = []
+        try:
+            for shard in shards:
+                self._locks[shard].acquire()
+                held.append(shard)
+                self._conns[shard].send(requests[shard])
+            for shard in shards:
+                status, result = self._conns[shard].recv()
+                held.remove(shard)
+                self._locks[shard].release()
+                if status == 'error':
+                    errors.append(f"shard {shard}: {result}")
+                results[shard] = result
+        finally:
+            for shard in held:
+                self._locks[shard].release()
+        if errors:
+            raise RuntimeError("; ".join(errors))
+        return results
+
+    def wait_ready(self):
+        """Block until every worker has read its shard file, e.g. before that file is deleted.
+
+        Workers read their file before answering any command, so one round
+        trip to each shard is enough.
+        """
+        self._call({s: ('ntotal', ()) for s in range(self.num_shards)})
+
+    def _route(self, ids):
+        return assign_shards(ids, self.num_shards, self.strategy, self.bounds)
+
+    @property
+    def ntotal(self):
+        results = self._call({s: ('ntotal', ()) for s in range(self.num_shards)})
+        return sum(results.values())
+
+    def search(self, x, k):
+        """Scatter the queries to all shards and merge their top-k lists."""
+        results = self._call({s: ('search', (x, k)) for s in range(self.num_shards)})
+        D = np.hstack([results[s][0] for s in range(self.num_shards)])
+        I = np.hstack([results[s][1] for s in range(self.num_shards)])
+
+        # Each shard pads missing hits with id -1 and -FLT_MAX, so they sort last
+        k = min(k, D.shape[1])
+        top = np.argpartition(-D, k - 1, axis=1)[:, :k]
+        top_scores = np.take_along_axis(D, top, axis=1)
+        order = np.argsort(-top_scores, axis=1, kind='stable')
+        top = np.take_along_axis(top, order, axis=1)
+        return np.take_along_axis(D, top, axis=1), np.take_along_axis(I, top, axis=1)
+
+    def add_with_ids(self, x, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        owners = self._route(ids)
+        requests = {}
+        for shard in np.unique(owners):
+            mask = owners == shard
+            requests[int(shard)] = ('add', (np.ascontiguousarray(x[mask]), ids[mask]))
+        if requests:
+            self._call(requests)
+
+    def remove_ids(self, ids):
+        ids = np.asarray(ids, dtype=np.int64)
+        owners = self._route(ids)
+        requests = {int(s): ('remove', (ids[owners == s],)) for s in np.unique(owners)}
+        if not requests:
+            return 0
+        return sum(self._call(requests).values())
+
+    def reconstruct_batch(self, ids):
+        """Fetch the stored vectors for ids from their owning shards, in order."""
+        ids = np.asarray(ids, dtype=np.int64)
+        owners = self._route(ids)
+        shards = [int(s) for s in np.unique(owners)]
+        results = self._call({s: ('reconstruct', (ids[owners == s],)) for s in shards})
+        vectors = np.empty((len(ids), self.d), dtype=np.float32)
+        for s in shards:
+            vectors[owners == s] = results[s]
+        return vectors
+    
+    def dump(self):
+        """All (ids, vectors) stored across the shards."""
+        results = self._call({s: ('dump', ()) for s in range(self.num_shards)})
+        ids = np.concatenate([results[s][0] for s in range(self.num_shards)])
+        vectors = np.vstack([results[s][1] for s in range(self.num_shards)])
+        return ids, vectors
+    
+    def updated(self, shards_dir, remove_ids, x=None, add_ids=None):
+        """New ShardedIndex with remove_ids removed and (x, add_ids) added.
+
+        Each shard writes a changed copy of its index to shards_dir and the
+        copy is served by new worker processes, so queries on this index
+        never see a half-applied update.
+        """
+        remove_ids = np.asarray(remove_ids, dtype=np.int64)
+        add_ids = np.asarray(add_ids if add_ids is not None else [], dtype=np.int64)
+        remove_owners = self._route(remove_ids)
+        add_owners = self._route(add_ids)
+        os.makedirs(shards_dir, exist_ok=True)
+        requests = {}
+        for s in range(self.num_shards):
+            mask = add_owners == s
+            x_shard = np.ascontiguousarray(x[mask]) if mask.any() else None
+            requests[s] = ('save_updated', (_shard_path(shards_dir, s), remove_ids[remove_owners == s],
+                                            x_shard, add_ids[mask]))
+        self._call(requests)
+        _write_manifest(shards_dir, self.num_shards, self.strategy, self.bounds, self.d)
+        return ShardedIndex(shards_dir, self.num_threads)
+
+    def save(self, shards_dir):
+        """Write every shard and the manifest to shards_dir."""
+        os.makedirs(shards_dir, exist_ok=True)
+        self._call({s: ('save', (_shard_path(shards_dir, s),)) for s in range(self.num_shards)})
+        _write_manifest(shards_dir, self.num_shards, self.strategy, self.bounds, self.d)
+
+    def close(self):
+        """Stop the shard worker processes."""
+        if not self._processes:
+            return
+        try:
+            self._call({s: ('close', ()) for s in range(self.num_shards)})
+        except (EOFError, BrokenPipeError, OSError):
+            pass
+        for process in self._processes:
+            process.join(timeout=5)
+        self._processes = []
@@ -1,7 +1,9 @@
 import re
 from src.db.vector_search import VectorSearch
 from src.db.graph_db import GraphDatabase
+from src.db.name_index import NameIndex
 from src.data_processor import load_and_clean_data
+from src.config import RERANK_OVERFETCH, RERANK_WEIGHTS
 
 class TextSearch:
     """Enhanced text search that combines vector search with intent extraction"""
@@ -14,9 +16,10 @@ class TextSearch:
         "thriller", "war", "western"
     ]
     
-    def __init__(self):
+    def __init__(self, rerank_weights=None):
         # Load the data
         self.df = load_and_clean_data()
+        self.rerank_weights = {**RERANK_WEIGHTS, **(rerank_weights or {})}
         
         # Initialize vector search
         self.vector_search = VectorSearch()
@@ -25,14 +28,16 @@ class TextSearch:
         # If the index doesn't exist, create it
         if self.vector_search.index is None:
             try:
-                self.vector_search.load_embeddings()
-                # Make sure df is available for vector search
-                self.vector_search.df = self.df
+                self.vector_search.load_embeddings(self.df)
             except:
                 print("Creating new embeddings...")
                 self.vector_search.create_embeddings(self.df)
         
-        self.graph_db = GraphDatabase()
+        # Make sure df is available for vector search, set once here so search never mutates state
+        if self.vector_search.df is None:
+            self.vector_search.df = self.df
+        
+        self.graph_db = GraphDatabase(name_index=NameIndex.from_dataframe(self.df))
     
     def extract_genre(self, query):
         """Extract genre mentions from a natural language query"""
@@ -54,37 +59,23 @@ class TextSearch:
         # Extract any genres mentioned in the query
         mentioned_genres = self.extract_genre(query)
         
-        # Make sure vector search has the dataframe
-        if self.vector_search.df is None:
-            self.vector_search.df = self.df
-        
-        # Get vector search results
-        vector_results = self.vector_search.search(query, top_k=top_k*2)  # Get more results than needed
+        # Overfetch candidates, then rerank them by similarity, genre match, rating, votes and recency
+        snapshot = self.vector_search.current_snapshot()
+        scores, ids = self.vector_search.search_ids(query, top_k=top_k * RERANK_OVERFETCH, snapshot=snapshot)
+        scores, ids = snapshot.reranker.rerank(scores, ids, mentioned_genres, top_k, self.rerank_weights)
         
-        if not mentioned_genres:
-            # No specific genre mentioned, just return vector results
-            return vector_results[:top_k]
-            
-        # Filter and rerank results based on genre
-        final_results = []
-        genre_matches = []
-        non_matches = []
-        
-        for result in vector_results:
-            # Check if the movie's genre matches any of the mentioned genres
-            movie_genres = [g.strip() for g in result['genre'].split(',')]
-            if any(genre in movie_genres for genre in mentioned_genres):
-                # Boost similarity score for genre matches
-                result['similarity_score'] += 0.2  # Boost the score
-                genre_matches.append(result)
-            else:
-                non_matches.append(result)
-        
-        # Sort genre matches by similarity score
-        genre_matches.sort(key=lambda x: x['similarity_score'], reverse=True)
-        non_matches.sort(key=lambda x: x['similarity_score'], reverse=True)
-        
-        # Combine results, prioritizing genre matches
-        final_results = genre_matches + non_matches
-        
-        return final_results[:top_k] 
\ No newline at end of file
+        return self.vector_search.format_results(scores, ids, snapshot)
+    
+    def search_batch(self, queries, top_k=10):
+        """Search for many natural language queries at once, one result list per query"""
+        snapshot = self.vector_search.current_snapshot()
+        candidates = self.vector_search.search_ids_batch(
+            queries, top_k=top_k * RERANK_OVERFETCH, snapshot=snapshot
+        )
+        results = []
+        for query, (scores, ids) in zip(queries, candidates):
+            scores, ids = snapshot.reranker.rerank(
+                scores, ids, self.extract_genre(query), top_k, self.rerank_weights
+            )
+            results.append(self.vector_search.format_results(scores, ids, snapshot))
+        return results
\ No newline at end of file
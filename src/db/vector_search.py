@@ -1,61 +1,433 @@
+import os
 import faiss
 import pickle
+import shutil
+import tempfile
+import threading
+import numpy as np
+import pandas as pd
 from sentence_transformers import SentenceTransformer
-from src.config import MODEL_NAME, EMBEDDINGS_INDEX_PATH, INDEX_TO_MOVIE_PATH
+from src.config import (
+    MODEL_NAME, EMBEDDINGS_INDEX_PATH, INDEX_TO_MOVIE_PATH,
+    ENCODE_WORKERS, ENCODE_BATCH_SIZE, NUM_SHARDS, SHARD_STRATEGY, SHARDS_DIR,
+    KNN_GRAPH_PATH, BUNDLE_POLL_SECONDS, RELOAD_GRACE_SECONDS
+)
+from src.data_processor import movie_id
+from src.db.batch_encoder import encode_parallel
+from src.db.encoders import get_encoder
+from src.db.sharded_index import ShardedIndex, build_shards
+from src.db.knn_graph import NeighborTable
+from src.db.reranker import Reranker
+from src.db.artifacts import ArtifactStore
+
+def _rekey_positional_index(index, index_to_movie):
+    """Re-key an index whose vectors are addressed by row position by movie id.
+
+    Titles that appear more than once map to the same id; only the first
+    row is kept, as create_embeddings does. Returns (IndexIDMap2, mapping).
+    """
+    titles = [index_to_movie[i] for i in range(index.ntotal)]
+    ids = np.array([movie_id(t) for t in titles], dtype=np.int64)
+    _, first = np.unique(ids, return_index=True)
+    first = np.sort(first)
+    id_map = faiss.IndexIDMap2(faiss.IndexFlatIP(index.d))
+    id_map.add_with_ids(index.reconstruct_n(0, index.ntotal)[first], ids[first])
+    return id_map, {int(ids[row]): titles[row] for row in first}
+
+
+def _changed_rows(df, stored_df, indexed_ids):
+    """Mask of df rows whose embedding text is new or differs from stored_df.
+
+    Rows for movies missing from the index are always included.
+    """
+    if stored_df is None:
+        return np.ones(len(df), dtype=bool)
+    changed = ~df['Movie_ID'].isin(list(indexed_ids))
+    previous = stored_df.drop_duplicates('Movie_ID').set_index('Movie_ID')['text_for_embedding']
+    changed |= df['Movie_ID'].map(previous).ne(df['text_for_embedding'])
+    return changed.to_numpy()
+
+
+class _Snapshot:
+    """Index, id-to-title mapping and movie data that are swapped as one unit.
+
+    Queries read self._snapshot once and use it throughout, so a reload or
+    catalog update never shows them a mix of old and new state. Snapshots
+    are never modified after construction, which makes them safe to share
+    between query threads. The neighbor table is only valid for the index
+    it was built from (index_checksum, None for an unpublished index): a
+    snapshot built for a new index starts without one and VectorSearch
+    attaches the table when the checksums match. Rerank features are built here, when a snapshot is
+    created for new movie data, so queries only ever read them.
+    """
+    
+    def __init__(self, index=None, index_to_movie=None, df=None, version=None, neighbor_table=None,
+                 reranker=None, index_checksum=None):
+        self.index = index
+        self.index_to_movie = index_to_movie if index_to_movie is not None else {}
+        self.df = df
+        self.version = version
+        self.index_checksum = index_checksum
+        self.neighbor_table = neighbor_table
+        if reranker is None and df is not None:
+            reranker = Reranker(df)
+        self.reranker = reranker
+        # Title -> row position (first row for duplicate titles) for result formatting
+        self.title_rows = {}
+        if df is not None:
+            for row, title in enumerate(df['Series_Title']):
+                self.title_rows.setdefault(title, row)
+    
+    def replace(self, **changes):
+        fields = dict(index=self.index, index_to_movie=self.index_to_movie,
+                      df=self.df, version=self.version, neighbor_table=self.neighbor_table,
+                      reranker=self.reranker, index_checksum=self.index_checksum)
+        if 'df' in changes and changes['df'] is not self.df:
+            fields['reranker'] = None
+        fields.update(changes)
+        return _Snapshot(**fields)
 
 class VectorSearch:
-    def __init__(self):
+    def __init__(self, encoder_backend=None, num_shards=None):
         self.model = SentenceTransformer(MODEL_NAME)
-        self.index = None
-        self.df = None
+        # Queries go through the configured backend, documents always use self.model
+        self.encoder = get_encoder(encoder_backend, model=self.model)
+        self.num_shards = NUM_SHARDS if num_shards is None else num_shards
+        self.store = ArtifactStore()
+        self.neighbors_path = KNN_GRAPH_PATH
+        self._snapshot = _Snapshot()
+        self._load_lock = threading.Lock()
+        self._swap_lock = threading.Lock()
+        self._watcher = None
+        self._watcher_stop = threading.Event()
     
-    def create_embeddings(self, df):
-        """Create and save embeddings for the movie dataset."""
-        self.df = df
+    @property
+    def sharded(self):
+        return bool(self.num_shards and self.num_shards > 1)
+    
+    @property
+    def index(self):
+        return self._snapshot.index
+    
+    @property
+    def index_to_movie(self):
+        return self._snapshot.index_to_movie
+    
+    @property
+    def df(self):
+        return self._snapshot.df
+    
+    @df.setter
+    def df(self, df):
+        with self._swap_lock:
+            self._snapshot = self._snapshot.replace(df=df)
+    
+    @property
+    def version(self):
+        """Artifact bundle version being served (None for legacy files)."""
+        return self._snapshot.version
+    
+    @property
+    def index_checksum(self):
+        """Checksum of the served index files (None for legacy files), see artifacts.index_checksum."""
+        return self._snapshot.index_checksum
+    
+    def ensure_loaded(self):
+        """Load the index on first use, once, even when several threads race to it."""
+        if self._snapshot.index is not None:
+            return
+        with self._load_lock:
+            if self._snapshot.index is None:
+                self.load_embeddings()
+    
+    def current_snapshot(self):
+        """The snapshot being served, loading it first if needed.
+
+        Callers that search and then format results should read it once and
+        pass it to both, so a reload in between cannot mix two versions.
+        """
+        self.ensure_loaded()
+        return self._snapshot
+    
+    def _swap(self, snapshot):
+        """Atomically switch to a new snapshot and retire the old one."""
+        with self._swap_lock:
+            old = self._snapshot
+            self._snapshot = snapshot
+        if isinstance(old.index, ShardedIndex) and old.index is not snapshot.index:
+            # Let in-flight queries on the old shards finish before stopping them
+            timer = threading.Timer(RELOAD_GRACE_SECONDS, old.index.close)
+            timer.daemon = True
+            timer.start()
+    
+    def create_embeddings(self, df, num_workers=None):
+        """Create embeddings for the movie dataset and publish them as a new bundle.
+
+        With num_workers > 1 (or ENCODE_WORKERS in config) the texts are
+        encoded by a process pool, see encode_parallel.
+        """
+        full_df = df
+        # Titles are the movie key (as in the graph), keep the first row for duplicates
+        df = df.drop_duplicates('Movie_ID')
+        texts = df['text_for_embedding'].tolist()
+        if num_workers is None:
+            num_workers = ENCODE_WORKERS
         
         # Generate embeddings
-        embeddings = self.model.encode(df['text_for_embedding'].tolist(), show_progress_bar=True)
+        if num_workers and num_workers > 1:
+            embeddings = encode_parallel(
+                texts, self.model.get_sentence_embedding_dimension(), num_workers=num_workers
+            )
+        else:
+            embeddings = self.model.encode(texts, batch_size=ENCODE_BATCH_SIZE, show_progress_bar=True)
         
         # Normalize the vectors
         faiss.normalize_L2(embeddings)
         
-        # Create FAISS index
-        dimension = embeddings.shape[1]
-        self.index = faiss.IndexFlatIP(dimension)
-        self.index.add(embeddings)
+        # Create FAISS index (one per shard when sharding), keyed by stable movie id
+        ids = df['Movie_ID'].to_numpy(dtype=np.int64)
+        if self.sharded:
+            build_shards(embeddings, ids, SHARDS_DIR, self.num_shards, SHARD_STRATEGY)
+            index = ShardedIndex(SHARDS_DIR)
+        else:
+            dimension = embeddings.shape[1]
+            index = faiss.IndexIDMap2(faiss.IndexFlatIP(dimension))
+            index.add_with_ids(embeddings, ids)
         
-        # Save the index
-        faiss.write_index(self.index, EMBEDDINGS_INDEX_PATH)
-        
-        # Save mapping from index position to movie
-        self.index_to_movie = {i: title for i, title in enumerate(df['Series_Title'])}
-        with open(INDEX_TO_MOVIE_PATH, 'wb') as f:
-            pickle.dump(self.index_to_movie, f)
+        # Save the index and the mapping from movie id to title
+        index_to_movie = dict(zip(ids.tolist(), df['Series_Title']))
+        self._publish(_Snapshot(index, index_to_movie, full_df))
+    
+    def _publish(self, snapshot):
+        """Save snapshot as a new artifact bundle and start serving it."""
+        version = self.store.publish(snapshot.index, snapshot.index_to_movie, snapshot.df)
+        checksum = self.store.manifest(version)['index_checksum']
+        self._swap(self._with_neighbors(snapshot.replace(version=version, index_checksum=checksum)))
     
-    def load_embeddings(self):
-        """Load existing embeddings and index."""
-        self.index = faiss.read_index(EMBEDDINGS_INDEX_PATH)
+    def _read_index_file(self):
+        """Read the single-file index and mapping, upgrading a positional index to movie ids."""
+        index = faiss.read_index(EMBEDDINGS_INDEX_PATH)
         with open(INDEX_TO_MOVIE_PATH, 'rb') as f:
-            self.index_to_movie = pickle.load(f)
+            index_to_movie = pickle.load(f)
+        
+        if not isinstance(index, faiss.IndexIDMap2):
+            # Older builds keyed vectors by row position, re-key them by movie id
+            index, index_to_movie = _rekey_positional_index(index, index_to_movie)
+        return index, index_to_movie
     
-    def search(self, query, top_k=10):
-        """Find similar movies based on text description."""
-        if self.index is None:
-            self.load_embeddings()
+    def load_embeddings(self, df=None):
+        """Load the current artifact bundle, falling back to the legacy index files.
+
+        df is the movie data to serve when the bundle doesn't carry any (or
+        for the legacy files). Loading never publishes or deletes bundles:
+        legacy files are served unversioned, and the first catalog update
+        (or create_embeddings) publishes them as a bundle.
+        """
+        if df is None:
+            df = self.df
+        bundle = self.store.load()
+        if bundle is not None:
+            movies = bundle.df if bundle.df is not None else df
+            self._swap(self._with_neighbors(_Snapshot(bundle.index, bundle.index_to_movie, movies,
+                                                      bundle.version, index_checksum=bundle.index_checksum)))
+            return
+        
+        if self.sharded:
+            # Shard the existing single-file index on first use
+            flat_index, index_to_movie = self._read_index_file()
+            embeddings = flat_index.index.reconstruct_n(0, flat_index.ntotal)
+            ids = faiss.vector_to_array(flat_index.id_map)
+            build_shards(embeddings, ids, SHARDS_DIR, self.num_shards, SHARD_STRATEGY)
+            index = ShardedIndex(SHARDS_DIR)
+        else:
+            index, index_to_movie = self._read_index_file()
+        self._swap(_Snapshot(index, index_to_movie, df))
+    
+    def reload_bundle(self, version=None):
+        """Switch to another bundle (default: the current one) without dropping queries."""
+        bundle = self.store.load(version)
+        if bundle is None:
+            raise FileNotFoundError(f"No artifact bundle published in {self.store.root}")
+        df = bundle.df if bundle.df is not None else self.df
+        self._swap(self._with_neighbors(_Snapshot(bundle.index, bundle.index_to_movie, df,
+                                                  bundle.version, index_checksum=bundle.index_checksum)))
+        return bundle.version
+    
+    def start_bundle_watcher(self, interval=BUNDLE_POLL_SECONDS):
+        """Poll for newly published bundles in the background and hot-reload them."""
+        if self._watcher is not None:
+            return
+        self._watcher_stop.clear()
+        
+        def watch():
+            while not self._watcher_stop.wait(interval):
+                try:
+                    current = self.store.current_version()
+                    if current and current != self.version:
+                        print(f"Reloading artifact bundle {current}...")
+                        self.reload_bundle(current)
+                except Exception as e:
+                    print(f"Warning: failed to reload artifact bundle: {e}")
+        
+        self._watcher = threading.Thread(target=watch, name="bundle-watcher", daemon=True)
+        self._watcher.start()
+    
+    def stop_bundle_watcher(self):
+        if self._watcher is not None:
+            self._watcher_stop.set()
+            self._watcher.join()
+            self._watcher = None
+    
+    def _updated_index(self, snapshot, remove_ids, embeddings=None, add_ids=None):
+        """Copy of the snapshot's index with the changes applied, leaving queries on snapshot undisturbed."""
+        if isinstance(snapshot.index, ShardedIndex):
+            staging = tempfile.mkdtemp(prefix='.staging-', dir=os.path.dirname(os.path.abspath(SHARDS_DIR)))
+            try:
+                index = snapshot.index.updated(staging, remove_ids, embeddings, add_ids)
+                # The staged files go away below, the bundle keeps its own copy
+                index.wait_ready()
+            finally:
+                shutil.rmtree(staging, ignore_errors=True)
+            return index
+        
+        index = faiss.clone_index(snapshot.index)
+        index.remove_ids(remove_ids)
+        if add_ids is not None and len(add_ids):
+            index.add_with_ids(embeddings, add_ids)
+        return index
+    
+    def upsert_movies(self, df):
+        """Add new movies and re-embed changed ones without rebuilding the index.
+
+        df must be cleaned with load_and_clean_data. Only movies that are new
+        or whose text_for_embedding changed are encoded; the movie data is
+        updated for every row. Changes are applied to a copy of the index
+        and published as a new bundle. Returns the number of movies encoded.
+        """
+        self.ensure_loaded()
+        df = df.drop_duplicates('Movie_ID')
+        if df.empty:
+            return 0
+        
+        snapshot = self._snapshot
+        ids = df['Movie_ID'].to_numpy(dtype=np.int64)
+        changed = df[_changed_rows(df, snapshot.df, snapshot.index_to_movie.keys())]
+        index = snapshot.index
+        if len(changed):
+            changed_ids = changed['Movie_ID'].to_numpy(dtype=np.int64)
+            embeddings = self.model.encode(
+                changed['text_for_embedding'].tolist(), batch_size=ENCODE_BATCH_SIZE, convert_to_numpy=True
+            )
+            faiss.normalize_L2(embeddings)
+            # Drop any previous vectors for these movies, then add the fresh ones
+            index = self._updated_index(snapshot, changed_ids, embeddings, changed_ids)
+        index_to_movie = dict(snapshot.index_to_movie)
+        index_to_movie.update(zip(ids.tolist(), df['Series_Title']))
+        movies = snapshot.df
+        if movies is not None:
+            kept = movies[~movies['Movie_ID'].isin(ids)]
+            movies = pd.concat([kept, df], ignore_index=True)
+        
+        self._publish(_Snapshot(index, index_to_movie, movies))
+        return len(changed)
+    
+    def delete_movies(self, titles):
+        """Remove movies from the index by title. Returns the number removed."""
+        self.ensure_loaded()
+        ids = np.array([movie_id(t) for t in titles], dtype=np.int64)
+        if len(ids) == 0:
+            return 0
+        
+        snapshot = self._snapshot
+        removed_ids = set(ids.tolist())
+        removed = len(removed_ids & snapshot.index_to_movie.keys())
+        index = self._updated_index(snapshot, ids)
+        index_to_movie = {i: t for i, t in snapshot.index_to_movie.items() if i not in removed_ids}
+        movies = snapshot.df
+        if movies is not None:
+            movies = movies[~movies['Movie_ID'].isin(ids)].reset_index(drop=True)
+        
+        self._publish(_Snapshot(index, index_to_movie, movies))
+        return removed
+    
+    def close(self):
+        """Stop the bundle watcher and shard worker processes, if any."""
+        self.stop_bundle_watcher()
+        if isinstance(self.index, ShardedIndex):
+            self.index.close()
+    
+    def search_ids(self, query, top_k=10, candidate_ids=None, snapshot=None):
+        """Find similar movies and return raw (scores, movie ids) arrays, best first.
+
+        With candidate_ids only those movies are considered: their stored
+        vectors are scanned exactly, so the cost scales with the number of
+        candidates instead of the catalog size. snapshot defaults to the one
+        currently served.
+        """
+        if snapshot is None:
+            snapshot = self.current_snapshot()
         
         # Create query embedding
-        query_embedding = self.model.encode([query])
+        query_embedding = self.encoder.encode([query])
         faiss.normalize_L2(query_embedding)
         
+        if candidate_ids is not None:
+            return self._scan_candidates(snapshot, query_embedding[0], candidate_ids, top_k)
+        
         # Search in the FAISS index
-        D, I = self.index.search(query_embedding, top_k)
+        D, I = snapshot.index.search(query_embedding, top_k)
         
-        # Format results
+        # FAISS pads with -1 when there are fewer than top_k vectors
+        found = I[0] >= 0
+        return D[0][found], I[0][found]
+    
+    def search_ids_batch(self, queries, top_k=10, snapshot=None):
+        """search_ids for many queries at once, encoding them in batches.
+
+        Returns one (scores, movie ids) pair per query.
+        """
+        if snapshot is None:
+            snapshot = self.current_snapshot()
+        if not queries:
+            return []
+        
+        query_embeddings = np.ascontiguousarray(
+            self.encoder.encode(list(queries), batch_size=ENCODE_BATCH_SIZE), dtype=np.float32
+        )
+        faiss.normalize_L2(query_embeddings)
+        D, I = snapshot.index.search(query_embeddings, top_k)
+        return [(d[i >= 0], i[i >= 0]) for d, i in zip(D, I)]
+    
+    def _scan_candidates(self, snapshot, query_vector, candidate_ids, top_k):
+        """Exact inner-product top-k over just the candidate movies."""
+        ids = np.array([i for i in set(int(i) for i in candidate_ids) if i in snapshot.index_to_movie],
+                       dtype=np.int64)
+        if len(ids) == 0:
+            return np.zeros(0, dtype=np.float32), ids
+        
+        scores = self._get_vectors(snapshot.index, ids) @ query_vector
+        if len(scores) > top_k:
+            top = np.argpartition(-scores, top_k - 1)[:top_k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return scores[top], ids[top]
+    
+    def format_results(self, scores, ids, snapshot=None):
+        """Turn (scores, movie ids) arrays into result dicts.
+
+        Pass the snapshot the ids were searched in; it defaults to the one
+        currently served.
+        """
+        return self._format(snapshot if snapshot is not None else self._snapshot, scores, ids)
+    
+    def _format(self, snapshot, scores, ids):
+        index_to_movie, df, title_rows = snapshot.index_to_movie, snapshot.df, snapshot.title_rows
         results = []
-        for i, (idx, score) in enumerate(zip(I[0], D[0])):
+        for idx, score in zip(ids, scores):
             movie_idx = int(idx)
-            if movie_idx in self.index_to_movie:
-                movie_row = self.df[self.df['Series_Title'] == self.index_to_movie[movie_idx]].iloc[0]
+            if movie_idx in index_to_movie and index_to_movie[movie_idx] in title_rows:
+                movie_row = df.iloc[title_rows[index_to_movie[movie_idx]]]
                 results.append({
                     'title': movie_row['Series_Title'],
                     'year': movie_row['Released_Year'],
@@ -65,4 +437,134 @@ class VectorSearch:
                     'similarity_score': float(score)
                 })
         
-        return results 
\ No newline at end of file
+        return results
+    
+    def _resolve_movie_id(self, snapshot, title_or_id):
+        """Movie id for a title or id that is present in the index."""
+        if isinstance(title_or_id, (int, np.integer)):
+            key = int(title_or_id)
+        else:
+            key = movie_id(title_or_id)
+        if key not in snapshot.index_to_movie:
+            raise ValueError(f"Movie not found in the index: {title_or_id}")
+        return key
+    
+    def _get_vectors(self, index, ids):
+        if isinstance(index, ShardedIndex):
+            return index.reconstruct_batch(ids)
+        return np.vstack([index.reconstruct(int(i)) for i in ids])
+    
+    def get_vectors(self, ids):
+        """Stored (normalized) vectors for movie ids, one row per id."""
+        self.ensure_loaded()
+        return self._get_vectors(self.index, ids)
+    
+    def get_all_vectors(self):
+        """All (movie ids, vectors) stored in the index."""
+        self.ensure_loaded()
+        index = self.index
+        if isinstance(index, ShardedIndex):
+            return index.dump()
+        return faiss.vector_to_array(index.id_map), index.index.reconstruct_n(0, index.ntotal)
+    
+    @property
+    def neighbor_table(self):
+        """Neighbor table attached to the served snapshot, if any."""
+        return self._snapshot.neighbor_table
+    
+    def _matching_neighbors(self, snapshot):
+        """The neighbor table built from snapshot's index, from memory or self.neighbors_path, or None."""
+        if snapshot.index_checksum is None:
+            return None
+        for table in (snapshot.neighbor_table, self._snapshot.neighbor_table):
+            if table is not None and table.index_checksum == snapshot.index_checksum:
+                return table
+        if os.path.exists(self.neighbors_path):
+            table = NeighborTable.load(self.neighbors_path)
+            if table.index_checksum == snapshot.index_checksum:
+                return table
+        return None
+    
+    def _with_neighbors(self, snapshot):
+        """snapshot with the matching neighbor table attached (or none, if there is no such table)."""
+        return snapshot.replace(neighbor_table=self._matching_neighbors(snapshot))
+    
+    def load_neighbors(self):
+        """Attach the table in self.neighbors_path to the served snapshot, e.g. after rebuilding it.
+
+        Bundles are loaded with their table already attached; this is only
+        needed when the table was built while serving. A table built from
+        a different index is not used. Returns whether the table was attached.
+        """
+        snapshot = self.current_snapshot()
+        table = self._matching_neighbors(snapshot)
+        if table is None:
+            print(f"Warning: {self.neighbors_path} was not built from the served index; "
+                  f"rebuild it with scripts/build_knn_graph.py")
+            return False
+        with self._swap_lock:
+            if self._snapshot is not snapshot:
+                # Replaced while loading, the table may not match the new index
+                return False
+            self._snapshot = snapshot.replace(neighbor_table=table)
+        return True
+    
+    def similar_to(self, title_or_id, top_k=10, combine='centroid'):
+        """Find movies similar to one or more known movies, without encoding any text.
+
+        title_or_id is a title or movie id, or a list of them (e.g. a watch
+        history). Several seeds are combined either by searching with their
+        normalized mean vector ('centroid') or by scoring each movie by its
+        best similarity to any seed ('max'). Seed movies are left out of
+        the results. Single-movie lookups are served from the neighbor
+        table when one is loaded and covers the movie and all its neighbors,
+        otherwise from the index.
+        """
+        snapshot = self.current_snapshot()
+        
+        seeds = title_or_id if isinstance(title_or_id, (list, tuple, set)) else [title_or_id]
+        seed_ids = np.array([self._resolve_movie_id(snapshot, s) for s in seeds], dtype=np.int64)
+        
+        table = snapshot.neighbor_table
+        if (table is not None and len(seed_ids) == 1 and seed_ids[0] in table
+                and top_k <= table.k):
+            scores, ids = table.neighbors(seed_ids[0], top_k)
+            keep = ids >= 0
+            scores, ids = scores[keep], ids[keep]
+            if len(ids) == top_k and all(int(i) in snapshot.index_to_movie for i in ids):
+                return self._format(snapshot, scores, ids)
+        
+        vectors = self._get_vectors(snapshot.index, seed_ids)
+        # Enough candidates to fill top_k after dropping the seeds themselves
+        fetch = top_k + len(seed_ids)
+        
+        if combine == 'centroid':
+            query = vectors.mean(axis=0, keepdims=True).astype(np.float32)
+            faiss.normalize_L2(query)
+            D, I = snapshot.index.search(query, fetch)
+            scores, ids = D[0], I[0]
+        elif combine == 'max':
+            D, I = snapshot.index.search(vectors, fetch)
+            # Best score per movie across all seed result lists, best first
+            order = np.argsort(-D.ravel(), kind='stable')
+            scores, ids = D.ravel()[order], I.ravel()[order]
+            _, first = np.unique(ids, return_index=True)
+            first = np.sort(first)
+            scores, ids = scores[first], ids[first]
+        else:
+            raise ValueError(f"Unknown combine mode: {combine}")
+        
+        keep = (ids >= 0) & ~np.isin(ids, seed_ids)
+        return self._format(snapshot, scores[keep][:top_k], ids[keep][:top_k])
+    
+    def search(self, query, top_k=10, candidate_ids=None):
+        """Find similar movies based on text description."""
+        snapshot = self.current_snapshot()
+        scores, ids = self.search_ids(query, top_k, candidate_ids, snapshot=snapshot)
+        return self._format(snapshot, scores, ids)
+    
+    def search_batch(self, queries, top_k=10):
+        """Find similar movies for many descriptions, one result list per query."""
+        snapshot = self.current_snapshot()
+        return [self._format(snapshot, scores, ids)
+                for scores, ids in self.search_ids_batch(queries, top_k, snapshot=snapshot)]
@@ -0,0 +1,47 @@
+import pytest
+
+from tests.fakes import FakeDriver, FakeModel, movies
+
+
+@pytest.fixture
+def catalog():
+    return movies([
+        ("Alien", "space horror crew alien ship", "Horror, Sci-Fi", 8.4, 1979),
+        ("Aliens", "space marines alien horror ship", "Action, Sci-Fi", 8.3, 1986),
+        ("Gravity", "space astronaut drifting station", "Drama, Sci-Fi", 7.7, 2013),
+        ("Heat", "heist crew detective los angeles", "Crime, Drama", 8.3, 1995),
+        ("Ronin", "heist crew mercenaries paris", "Action, Crime", 7.2, 1998),
+        ("Up", "old man balloon house adventure", "Animation, Adventure", 8.2, 2009),
+    ])
+
+
+@pytest.fixture
+def make_vector_search(monkeypatch, tmp_path):
+    """Build VectorSearch instances backed by FakeModel, a temporary bundle store and neighbor table path."""
+    pytest.importorskip("sentence_transformers")
+    from src.db import vector_search as module
+    from src.db.artifacts import ArtifactStore
+
+    monkeypatch.setattr(module, 'SentenceTransformer', lambda name: FakeModel())
+    monkeypatch.setattr(module, 'get_encoder', lambda backend=None, model=None, num_threads=None: model)
+    created = []
+
+    def make(**kwargs):
+        vector_search = module.VectorSearch(**kwargs)
+        vector_search.store = ArtifactStore(str(tmp_path / 'bundles'))
+        vector_search.neighbors_path = str(tmp_path / 'knn_graph.npz')
+        created.append(vector_search)
+        return vector_search
+
+    yield make
+    for vector_search in created:
+        vector_search.close()
+
+
+@pytest.fixture
+def graph(monkeypatch):
+    """GraphDatabase talking to a FakeDriver (its session is graph.driver.session_obj)."""
+    from src.db import graph_db as module
+
+    monkeypatch.setattr(module.Neo4jDriver, 'driver', lambda *args, **kwargs: FakeDriver())
+    return module.GraphDatabase()
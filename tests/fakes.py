@@ -0,0 +1,82 @@
+import zlib
+
+import numpy as np
+import pandas as pd
+
+from src.data_processor import movie_id
+
+DIMENSION = 32
+
+
+class FakeModel:
+    """Stands in for the SentenceTransformer: a normalized bag of hashed words."""
+
+    def get_sentence_embedding_dimension(self):
+        return DIMENSION
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        vectors = np.zeros((len(texts), DIMENSION), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in str(text).lower().split():
+                vectors[row, zlib.crc32(word.encode()) % DIMENSION] += 1.0
+        vectors[:, 0] += 1e-3
+        return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def movies(rows):
+    """Minimal cleaned catalog from (title, text, genre, rating, year) rows."""
+    df = pd.DataFrame(rows, columns=['Series_Title', 'text_for_embedding', 'Genre',
+                                     'IMDB_Rating', 'Released_Year'])
+    df['Overview'] = df['text_for_embedding']
+    df['No_of_Votes'] = 1000
+    df['Movie_ID'] = df['Series_Title'].map(movie_id).astype(np.int64)
+    return df
+
+
+class FakeResult(list):
+    def data(self):
+        return list(self)
+
+    def single(self):
+        return self[0] if self else None
+
+
+class FakeSession:
+    """Neo4j session stand-in: answers movie and name lookups from lists, records everything run."""
+
+    def __init__(self, existing=None):
+        self.existing = existing or {}
+        self.people = []
+        self.genres = []
+        self.queries = []
+        self.writes = []
+
+    def run(self, query, **params):
+        self.queries.append((query, params))
+        if 'properties(m) AS props' in query:
+            return FakeResult(self.existing[t] for t in params['titles'] if t in self.existing)
+        if 'MATCH (p:Person) RETURN' in query:
+            return FakeResult(self.people)
+        if 'MATCH (g:Genre) RETURN' in query:
+            return FakeResult(self.genres)
+        return FakeResult()
+
+    def execute_write(self, fn, *args):
+        self.writes.append((fn.__name__, args[0]['Series_Title']))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class FakeDriver:
+    def __init__(self):
+        self.session_obj = FakeSession()
+
+    def session(self):
+        return self.session_obj
+
+    def close(self):
+        pass
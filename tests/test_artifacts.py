@@ -0,0 +1,33 @@
+import faiss
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.db.artifacts import DATA_FILE, ArtifactStore
+
+
+def flat_index():
+    index = faiss.IndexIDMap2(faiss.IndexFlatIP(4))
+    index.add_with_ids(np.eye(2, 4, dtype=np.float32), np.array([10, 20], dtype=np.int64))
+    return index
+
+
+def test_publish_requires_movie_data(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    with pytest.raises(ValueError):
+        store.publish(flat_index(), {10: "A", 20: "B"}, None)
+    assert store.versions() == []
+    assert store.current_version() is None
+
+
+def test_published_bundle_carries_index_mapping_and_data(tmp_path):
+    store = ArtifactStore(str(tmp_path))
+    df = pd.DataFrame({'Series_Title': ["A", "B"]})
+    version = store.publish(flat_index(), {10: "A", 20: "B"}, df)
+
+    assert DATA_FILE in store.manifest(version)['files']
+    bundle = store.load()
+    assert bundle.version == version
+    assert bundle.index.ntotal == 2
+    assert bundle.index_to_movie == {10: "A", 20: "B"}
+    pd.testing.assert_frame_equal(bundle.df, df)
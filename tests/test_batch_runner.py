@@ -0,0 +1,71 @@
+import io
+import json
+
+import pytest
+
+from src.batch_runner import BatchRunner, _validate
+
+
+@pytest.mark.parametrize("query, error", [
+    ({"type": "vector", "query": "space"}, None),
+    ({"type": "vector", "query": "   "}, "query must be a non-empty string"),
+    ({"type": "text", "query": 42}, "query must be a non-empty string"),
+    ({"type": "hybrid", "genre": "Drama"}, "query must be a non-empty string"),
+    ({"type": "vector", "query": "space", "top_k": 0}, "top_k must be a positive integer"),
+    ({"type": "vector", "query": "space", "top_k": "5"}, "top_k must be a positive integer"),
+    ({"type": "vector", "query": "space", "top_k": True}, "top_k must be a positive integer"),
+    ({"type": "autocomplete"}, "prefix must be a string"),
+    ({"type": "actor_collaboration", "actor": "Tom Hanks", "top_k": 3}, None),
+])
+def test_validate(query, error):
+    assert _validate(query) == error
+
+
+@pytest.fixture
+def runner(make_vector_search, catalog, graph):
+    vector_search = make_vector_search()
+    vector_search.create_embeddings(catalog)
+    return BatchRunner(graph, vector_search, None, workers=2, batch_size=2, top_k=2)
+
+
+def run(runner, lines):
+    out = io.StringIO()
+    count = runner.run(lines, out)
+    records = [json.loads(line) for line in out.getvalue().splitlines()]
+    return count, {record["id"]: record for record in records}
+
+
+def test_results_carry_query_ids(runner):
+    count, records = run(runner, [
+        '{"type": "vector", "query": "space alien horror", "top_k": 1}',
+        '',
+        '{"id": "q3", "type": "vector", "query": "heist crew paris"}',
+        '{"type": "vector", "query": "balloon house", "top_k": 1}',
+        '{"type": "actor_collaboration", "actor": "Tom Hanks"}',
+    ])
+
+    assert count == 4
+    assert sorted(records, key=str) == [1, 4, 5, "q3"]
+    assert [r['title'] for r in records[1]["results"]] == ["Alien"]
+    assert records["q3"]["results"][0]['title'] == "Ronin"
+    assert len(records["q3"]["results"]) == 2
+    assert [r['title'] for r in records[4]["results"]] == ["Up"]
+    assert records[5] == {"id": 5, "type": "actor_collaboration", "results": []}
+
+
+def test_bad_lines_get_their_own_errors(runner):
+    count, records = run(runner, [
+        '{"type": "vector", "query": "space alien horror"',
+        '{"type": "vector", "query": ""}',
+        '{"type": "vector", "query": "heist crew paris", "top_k": -1}',
+        '{"type": "vector", "query": "space alien horror", "top_k": 1}',
+        '{"type": "unknown"}',
+    ])
+
+    assert count == 5
+    assert records[1]["error"].startswith("Invalid JSON")
+    assert records[2]["error"] == "query must be a non-empty string"
+    assert records[3]["error"] == "top_k must be a positive integer"
+    # The valid query that would have shared their batch still runs
+    assert [r['title'] for r in records[4]["results"]] == ["Alien"]
+    assert records[5]["error"] == "Unsupported or incomplete query: unknown"
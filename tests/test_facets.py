@@ -0,0 +1,68 @@
+import pandas as pd
+import pytest
+
+from src.db.facets import FacetStore
+
+PAIRS = [('genre', 'decade'), ('director', 'genre')]
+
+
+@pytest.fixture
+def store():
+    df = pd.DataFrame([
+        ("Heat", 8.3, 600000, 1995, "Action, Crime, Drama", "Michael Mann", "A"),
+        ("Se7en", 8.6, 1400000, 1995, "Crime, Drama, Mystery", "David Fincher", "A"),
+        ("Fight Club", 8.8, 1900000, 1999, "Drama", "David Fincher", "A"),
+        ("Zodiac", 7.7, 500000, 2007, "Crime, Drama, Mystery", "David Fincher", "UA"),
+        ("Collateral", 7.5, 500000, 2004, "Action, Crime, Drama", "Michael Mann", "UA"),
+        # Same title twice in the dataset, counted once
+        ("Collateral", 7.5, 500000, 2004, "Action, Crime, Drama", "Michael Mann", "UA"),
+    ], columns=['Series_Title', 'IMDB_Rating', 'No_of_Votes', 'Released_Year',
+                'Genre', 'Director', 'Certificate'])
+    return FacetStore.materialize(df, top_n=3, pairs=PAIRS)
+
+
+def test_exploded_genres_count_each_movie_once_per_genre(store):
+    assert store.count(genre='Drama') == 5
+    assert store.count(genre='Crime') == 4
+    assert store.count(genre='Action') == 2
+    assert store.count(genre='Mystery') == 2
+    values = store.values('genre')
+    assert values[:2] == [('Drama', 5), ('Crime', 4)]
+    assert dict(values) == {'Drama': 5, 'Crime': 4, 'Action': 2, 'Mystery': 2}
+
+
+def test_pair_counts(store):
+    assert store.count(genre='Drama', decade=1990) == 3
+    assert store.count(genre='Crime', decade='2000s') == 2
+    # Pairs can be given in either order
+    assert store.count(decade=1990, genre='Mystery') == 1
+    assert store.count(director='David Fincher', genre='Mystery') == 2
+    assert store.count(genre='Western', decade=1990) == 0
+
+
+def test_lookups_ignore_case_and_spacing(store):
+    assert store.count(director='  david fincher ') == 3
+    assert store.count(genre='drama') == 5
+
+
+def test_top_is_best_rated_first_and_capped(store):
+    assert [m['title'] for m in store.top(genre='Drama')] == ["Fight Club", "Se7en", "Heat"]
+    assert store.top(limit=1, genre='Crime', decade=2000) == [
+        {'title': "Zodiac", 'year': 2007, 'rating': 7.7}
+    ]
+    assert store.top(genre='Western') == []
+
+
+def test_unmaterialized_combinations_are_rejected(store):
+    with pytest.raises(ValueError):
+        store.count(certificate='A', decade=1990)
+    with pytest.raises(ValueError):
+        store.count()
+
+
+def test_save_and_load_round_trip(store, tmp_path):
+    path = str(tmp_path / 'facets.pkl')
+    store.save(path)
+    loaded = FacetStore.load(path)
+    assert loaded.count(genre='Drama', decade=1990) == 3
+    assert loaded.top(limit=2, director='Michael Mann') == store.top(limit=2, director='Michael Mann')
@@ -0,0 +1,61 @@
+from src.db.name_index import NameIndex
+
+
+def search_params(session):
+    """Parameters of the searches run so far, excluding setup and name-index queries."""
+    return [params for query, params in session.queries
+            if 'CONSTRAINT' not in query and 'RETURN p.name' not in query and 'RETURN g.name' not in query]
+
+
+def test_names_are_resolved_before_the_query_runs(graph):
+    session = graph.driver.session_obj
+    graph.name_index = NameIndex({'director': ["Christopher Nolan"]})
+
+    graph.search("director_rating", {"director": " christopher nolen ", "min_rating": 8.0})
+
+    # One round trip, already with the canonical name
+    assert search_params(session) == [{'director_name': "Christopher Nolan", 'min_rating': 8.0}]
+
+
+def test_known_and_unmatched_names_are_queried_as_typed(graph):
+    session = graph.driver.session_obj
+    graph.name_index = NameIndex({'actor': ["Tom Hanks"], 'genre': ["Drama"]})
+
+    graph.search("actor_genre", {"actor": "Tom Hanks", "genre": "Drama"})
+    graph.search("actor_collaboration", {"actor": "Zendaya"})
+
+    assert search_params(session) == [
+        {'actor_name': "Tom Hanks", 'genre_name': "Drama"},
+        {'actor_name': "Zendaya"},
+    ]
+
+
+def test_caller_params_are_not_modified(graph):
+    graph.name_index = NameIndex({'actor': ["Tom Hanks"]})
+    params = {"actor": "tom hanks "}
+    graph.search("actor_collaboration", params)
+    assert params == {"actor": "tom hanks "}
+
+
+def test_candidate_titles_resolve_filters(graph):
+    session = graph.driver.session_obj
+    graph.name_index = NameIndex({'genre': ["Sci-Fi"]})
+
+    graph.candidate_titles({"genre": "scifi", "actor": "", "min_rating": 8})
+
+    assert search_params(session) == [{'genre': "Sci-Fi", 'min_rating': 8}]
+
+
+def test_refresh_name_index_learns_new_names(graph):
+    session = graph.driver.session_obj
+    graph.name_index = NameIndex({'actor': ["Tom Hanks"]})
+    session.people = [{'name': "Tom Hanks", 'role': 'Actor'}, {'name': "Tom Hankz", 'role': 'Actor'},
+                      {'name': "Greta Gerwig", 'role': 'Director'}]
+    session.genres = [{'name': "Drama"}]
+
+    graph.refresh_name_index()
+
+    # A newly added actor with a close spelling is no longer rewritten
+    assert graph.resolve_names({"actor": "Tom Hankz"}) == {"actor": "Tom Hankz"}
+    assert graph.autocomplete("greta", "director") == ["Greta Gerwig"]
+    assert graph.resolve_names({"genre": "drama"}) == {"genre": "Drama"}
@@ -0,0 +1,60 @@
+import pandas as pd
+
+
+def movie(title, rating=8.0, director="Jane Doe", stars=("Ann Lee", "Bo Kim", "", ""), genre="Drama, Crime"):
+    return {
+        'Series_Title': title, 'Released_Year': 1999, 'IMDB_Rating': rating, 'Runtime': '120 min',
+        'Overview': 'A story.', 'Meta_score': 70.0, 'No_of_votes': 1000, 'Gross': '1,000',
+        'Certificate': 'A', 'Poster_Link': '', 'Director': director,
+        'Star1': stars[0], 'Star2': stars[1], 'Star3': stars[2], 'Star4': stars[3], 'Genre': genre,
+    }
+
+
+def stored(graph, row):
+    """The record the existing-movie lookup returns for a movie stored from row."""
+    row = graph._prepare_row(pd.Series(row))
+    directors, actors, genres = graph._movie_links(row)
+    props = graph._movie_props(row)
+    return {'title': props['title'], 'props': props,
+            'directors': directors, 'actors': actors, 'genres': genres}
+
+
+def test_upsert_diffs_against_stored_movies(graph):
+    session = graph.driver.session_obj
+    session.existing = {
+        'Same': stored(graph, movie('Same')),
+        'Rerated': stored(graph, movie('Rerated')),
+        'Recast': stored(graph, movie('Recast')),
+        'Regenred': stored(graph, movie('Regenred')),
+    }
+    df = pd.DataFrame([
+        movie('Same'),
+        movie('Rerated', rating=8.5),
+        movie('Recast', stars=("Ann Lee", "Cy Park", "", "")),
+        movie('Regenred', genre="Drama"),
+        movie('New'),
+    ])
+
+    counts = graph.upsert_movies(df)
+
+    assert counts == {'added': 1, 'updated': 3, 'unchanged': 1}
+    assert sorted(session.writes) == [
+        ('_add_movie_tx', 'New'),
+        ('_update_movie_tx', 'Recast'),
+        ('_update_movie_tx', 'Regenred'),
+        ('_update_movie_tx', 'Rerated'),
+    ]
+
+
+def test_upsert_ignores_link_order(graph):
+    session = graph.driver.session_obj
+    record = stored(graph, movie('Same'))
+    record['actors'] = list(reversed(record['actors']))
+    record['genres'] = list(reversed(record['genres']))
+    session.existing = {'Same': record}
+
+    counts = graph.upsert_movies(pd.DataFrame([movie('Same')]))
+
+    assert counts == {'added': 0, 'updated': 0, 'unchanged': 1}
+    assert session.writes == []
+
@@ -0,0 +1,60 @@
+import numpy as np
+
+from src.db.knn_graph import NeighborTable, build_knn_graph
+
+
+def test_neighbors_are_best_first_and_exclude_self():
+    vectors = np.array([[1, 0], [0.9, 0.1], [0, 1], [0.1, 0.9]], dtype=np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    table = build_knn_graph([10, 11, 12, 13], vectors, k=2, chunk_size=3, num_threads=2)
+
+    scores, ids = table.neighbors(10)
+    assert ids.tolist() == [11, 13]
+    assert scores[0] >= scores[1]
+    assert table.neighbors(12, top_k=1)[1].tolist() == [13]
+
+
+def test_save_and_load_keep_the_index_checksum(tmp_path):
+    table = NeighborTable(np.array([1, 2]), np.array([[2], [1]]), np.array([[0.5], [0.5]], dtype=np.float32),
+                          index_checksum="abc")
+    path = str(tmp_path / 'knn.npz')
+    table.save(path)
+    loaded = NeighborTable.load(path)
+    assert loaded.index_checksum == "abc"
+    assert list(loaded.edges()) == [(1, 2, 0.5), (2, 1, 0.5)]
+
+
+def build_table(vector_search):
+    ids, vectors = vector_search.get_all_vectors()
+    table = build_knn_graph(ids, vectors, k=3, index_checksum=vector_search.index_checksum)
+    table.save(vector_search.neighbors_path)
+    return table
+
+
+def test_table_is_attached_while_it_matches_the_index(make_vector_search, catalog):
+    vector_search = make_vector_search()
+    vector_search.create_embeddings(catalog)
+    assert vector_search.neighbor_table is None
+    build_table(vector_search)
+
+    # Loading the bundle picks the table up without load_neighbors
+    serving = make_vector_search()
+    serving.load_embeddings()
+    assert serving.neighbor_table is not None
+    assert serving.similar_to("Alien", top_k=1)[0]['title'] == "Aliens"
+
+    # A data-only update keeps the same vectors, and the table with them
+    edited = catalog[catalog['Series_Title'] == "Heat"].assign(IMDB_Rating=9.0)
+    assert serving.upsert_movies(edited) == 0
+    assert serving.neighbor_table is not None
+
+    # Changing the vectors drops it, even after a reload of the new bundle
+    serving.delete_movies(["Aliens"])
+    assert serving.neighbor_table is None
+    serving.reload_bundle()
+    assert serving.neighbor_table is None
+    assert serving.load_neighbors() is False
+    assert serving.similar_to("Alien", top_k=1)[0]['title'] != "Aliens"
+
+    build_table(serving)
+    assert serving.load_neighbors() is True
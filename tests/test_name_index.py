@@ -0,0 +1,75 @@
+import random
+
+import pytest
+
+from src.db.name_index import NameIndex, _edit_distance, normalize_name
+
+
+def levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        for j, cb in enumerate(b, 1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb)))
+        previous = current
+    return previous[-1]
+
+
+@pytest.mark.parametrize("a, b, expected", [
+    ("", "", 0),
+    ("nolan", "nolan", 0),
+    ("nolan", "nolen", 1),
+    ("christophernolan", "christophernolen", 1),
+    ("hanks", "hnaks", 2),
+    ("abc", "", 3),
+])
+def test_edit_distance(a, b, expected):
+    assert _edit_distance(a, b, limit=5) == expected
+
+
+def test_edit_distance_is_capped_at_limit_plus_one():
+    assert _edit_distance("kitten", "sitting", limit=3) == 3
+    assert _edit_distance("kitten", "sitting", limit=2) == 3
+    assert _edit_distance("a", "abcdef", limit=2) == 3
+
+
+def test_banded_edit_distance_matches_full_levenshtein():
+    rng = random.Random(0)
+    for _ in range(2000):
+        a = ''.join(rng.choice('abc') for _ in range(rng.randint(0, 8)))
+        b = ''.join(rng.choice('abc') for _ in range(rng.randint(0, 8)))
+        limit = rng.randint(0, 4)
+        assert _edit_distance(a, b, limit) == min(levenshtein(a, b), limit + 1)
+
+
+@pytest.fixture
+def index():
+    return NameIndex({
+        'actor': ["Tom Hanks", "Tom Hardy", "Tom Holland", "Leonardo DiCaprio", "Amy Adams", "Tom Hanks"],
+        'director': ["Christopher Nolan", "Christopher Guest"],
+        'genre': ["Drama", "Sci-Fi"],
+    })
+
+
+def test_normalize_name():
+    assert normalize_name("Leonardo Di Caprio") == "leonardodicaprio"
+    assert normalize_name("Pedro Almodóvar") == "pedroalmodovar"
+
+
+def test_resolve(index):
+    assert index.resolve("tom hanks", 'actor') == "Tom Hanks"
+    assert index.resolve("Leonardo Di Caprio", 'actor') == "Leonardo DiCaprio"
+    assert index.resolve("Christopher Nolen", 'director') == "Christopher Nolan"
+    assert index.resolve("scifi", 'genre') == "Sci-Fi"
+    assert index.resolve("Meryl Streep", 'actor') is None
+    # Kinds are separate
+    assert index.resolve("Christopher Nolan", 'actor') is None
+
+
+def test_autocomplete_matches_any_word(index):
+    assert index.autocomplete("tom h", 'actor') == ["Tom Hanks", "Tom Hardy", "Tom Holland"]
+    assert index.autocomplete("ha", 'actor') == ["Tom Hanks", "Tom Hardy"]
+    assert index.autocomplete("ada", 'actor') == ["Amy Adams"]
+    assert index.autocomplete("tom", 'actor', limit=2) == ["Tom Hanks", "Tom Hardy"]
+    assert index.autocomplete("", 'actor') == []
+    assert index.autocomplete("chris", 'director') == ["Christopher Guest", "Christopher Nolan"]
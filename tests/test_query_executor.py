@@ -0,0 +1,72 @@
+import threading
+
+import pytest
+
+from src.db.query_executor import QueryExecutor, ThreadBudget
+from tests.fakes import FakeModel
+
+
+class GatedEncoder(FakeModel):
+    """Encoder that holds each query until released, to swap snapshots mid-query."""
+
+    def __init__(self):
+        self.started = threading.Event()
+        self.release = threading.Event()
+
+    def encode(self, texts, **kwargs):
+        self.started.set()
+        assert self.release.wait(5)
+        return super().encode(texts, **kwargs)
+
+
+class ThreadedEncoder(FakeModel):
+    def __init__(self, num_threads):
+        self.num_threads = num_threads
+
+    def set_num_threads(self, num_threads):
+        previous, self.num_threads = self.num_threads, num_threads
+        return previous
+
+
+@pytest.fixture
+def vector_search(make_vector_search, catalog):
+    vector_search = make_vector_search()
+    vector_search.create_embeddings(catalog)
+    return vector_search
+
+
+def test_query_keeps_its_snapshot_across_a_swap(vector_search):
+    encoder = GatedEncoder()
+    vector_search.encoder = encoder
+    with QueryExecutor(vector_search, workers=2, faiss_threads=1, torch_threads=1) as executor:
+        future = executor.submit("vector", "space alien horror", top_k=2)
+        assert encoder.started.wait(5)
+        # The query has read its snapshot, the catalog changes underneath it
+        vector_search.delete_movies(["Alien", "Aliens"])
+        encoder.release.set()
+        results = future.result(timeout=5)
+
+        # Searched and formatted against the old snapshot, never a mix of both
+        assert sorted(r['title'] for r in results) == ["Alien", "Aliens"]
+        assert all(r['overview'] for r in results)
+
+        after = executor.submit("vector", "space alien horror", top_k=2).result(timeout=5)
+        assert not {"Alien", "Aliens"} & {r['title'] for r in after}
+
+
+def test_concurrent_queries_match_serial_results(vector_search):
+    queries = ["space alien horror", "heist crew paris", "balloon house", "astronaut station"] * 5
+    serial = [vector_search.search(q, top_k=3) for q in queries]
+    with QueryExecutor(vector_search, workers=4, faiss_threads=1, torch_threads=1) as executor:
+        assert executor.map("vector", queries, top_k=3) == serial
+        with pytest.raises(ValueError):
+            executor.submit("text", "space")
+
+
+def test_budget_restores_encoder_threads():
+    encoder = ThreadedEncoder(8)
+    budget = ThreadBudget(workers=4, faiss_threads=1, torch_threads=2, encoder=encoder)
+    with budget as initializer:
+        assert encoder.num_threads == 2
+        initializer()
+    assert encoder.num_threads == 8
@@ -0,0 +1,69 @@
+import numpy as np
+import pytest
+
+from src.db.reranker import Reranker
+from tests.fakes import movies
+
+
+@pytest.fixture
+def reranker(catalog):
+    return Reranker(catalog)
+
+
+def ids_of(catalog, *titles):
+    by_title = dict(zip(catalog['Series_Title'], catalog['Movie_ID']))
+    return np.array([by_title[t] for t in titles], dtype=np.int64)
+
+
+def test_similarity_only_keeps_search_order(reranker, catalog):
+    ids = ids_of(catalog, "Heat", "Alien", "Up")
+    scores, ranked = reranker.rerank(np.array([0.9, 0.8, 0.1]), ids, top_k=2,
+                                     weights={'genre': 0.0})
+    np.testing.assert_array_equal(ranked, ids[:2])
+    np.testing.assert_allclose(scores, [0.9, 0.8])
+
+
+def test_genre_match_is_an_additive_boost(reranker, catalog):
+    ids = ids_of(catalog, "Heat", "Alien", "Gravity")
+    similarities = np.array([0.9, 0.8, 0.3])
+    # Alien is Horror: 0.8 + 0.2 beats Heat's 0.9, Gravity's 0.3 + 0.2 does not
+    scores, ranked = reranker.rerank(similarities, ids, ["Horror", "Sci-Fi"], top_k=3)
+    np.testing.assert_array_equal(ranked, ids_of(catalog, "Alien", "Heat", "Gravity"))
+    np.testing.assert_allclose(scores, [1.0, 0.9, 0.5])
+
+
+def test_genre_weight_above_two_ranks_every_match_first(reranker, catalog):
+    ids = ids_of(catalog, "Heat", "Ronin", "Gravity")
+    similarities = np.array([0.9, 0.8, -0.9])
+    _, ranked = reranker.rerank(similarities, ids, ["Sci-Fi"], top_k=3, weights={'genre': 2.1})
+    assert ranked[0] == ids_of(catalog, "Gravity")[0]
+
+
+def test_rating_weight_uses_scaled_ratings(reranker, catalog):
+    ids = ids_of(catalog, "Ronin", "Alien")
+    _, ranked = reranker.rerank(np.array([0.5, 0.5]), ids, top_k=2,
+                                weights={'similarity': 1.0, 'rating': 1.0})
+    np.testing.assert_array_equal(ranked, ids_of(catalog, "Alien", "Ronin"))
+
+
+def test_unknown_movies_score_on_similarity_alone(reranker, catalog):
+    unknown = np.array([12345], dtype=np.int64)
+    scores = reranker.score(np.array([0.5]), unknown, ["Drama"],
+                            weights={'rating': 1.0, 'votes': 1.0, 'recency': 1.0})
+    np.testing.assert_allclose(scores, [0.5])
+
+
+def test_snapshots_build_features_for_new_movies(make_vector_search, catalog):
+    vector_search = make_vector_search()
+    vector_search.create_embeddings(catalog)
+    before = vector_search.current_snapshot().reranker
+
+    added = movies([("Sunshine", "space crew sun mission", "Sci-Fi, Thriller", 7.2, 2007)])
+    vector_search.upsert_movies(added)
+    snapshot = vector_search.current_snapshot()
+
+    assert snapshot.reranker is not before
+    score = snapshot.reranker.score(np.array([0.0]), added['Movie_ID'].to_numpy(), ["Thriller"])
+    np.testing.assert_allclose(score, [0.2])
+    # Swapping in the same movie data (e.g. a new version) keeps the features
+    assert snapshot.replace(version="other").reranker is snapshot.reranker
@@ -0,0 +1,115 @@
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import faiss
+import numpy as np
+import pytest
+
+from src.db.sharded_index import ShardedIndex, assign_shards, build_shards
+
+DIMENSION = 16
+
+
+@pytest.fixture(scope="module")
+def data():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((60, DIMENSION)).astype(np.float32)
+    faiss.normalize_L2(vectors)
+    ids = rng.integers(0, 2 ** 62, len(vectors)).astype(np.int64)
+    queries = rng.standard_normal((5, DIMENSION)).astype(np.float32)
+    faiss.normalize_L2(queries)
+    return vectors, ids, queries
+
+
+def flat_index(vectors, ids):
+    index = faiss.IndexIDMap2(faiss.IndexFlatIP(DIMENSION))
+    index.add_with_ids(vectors, ids)
+    return index
+
+
+@pytest.fixture(scope="module", params=["hash", "range"])
+def sharded(request, data, tmp_path_factory):
+    vectors, ids, _ = data
+    shards_dir = str(tmp_path_factory.mktemp(request.param))
+    build_shards(vectors, ids, shards_dir, num_shards=4, strategy=request.param)
+    index = ShardedIndex(shards_dir, num_threads=1)
+    yield index
+    index.close()
+
+
+def test_every_id_is_owned_by_one_shard(sharded, data):
+    _, ids, _ = data
+    owners = assign_shards(ids, sharded.num_shards, sharded.strategy, sharded.bounds)
+    assert owners.min() >= 0 and owners.max() < sharded.num_shards
+    assert sharded.ntotal == len(ids)
+
+
+@pytest.mark.parametrize("k", [1, 10, 40])
+def test_search_matches_flat_index(sharded, data, k):
+    vectors, ids, queries = data
+    # 60 vectors over 4 shards: k=40 is more than any single shard holds
+    D, I = sharded.search(queries, k)
+    expected_D, expected_I = flat_index(vectors, ids).search(queries, k)
+    np.testing.assert_array_equal(I, expected_I)
+    np.testing.assert_allclose(D, expected_D, rtol=1e-5)
+
+
+def test_search_pads_when_k_exceeds_total(sharded, data):
+    _, ids, queries = data
+    D, I = sharded.search(queries, len(ids) + 5)
+    assert I.shape == (len(queries), len(ids) + 5)
+    assert (I[:, :len(ids)] >= 0).all()
+    assert (I[:, len(ids):] == -1).all()
+
+
+def test_reconstruct_batch_returns_vectors_in_request_order(sharded, data):
+    vectors, ids, _ = data
+    order = np.array([7, 3, 42, 0])
+    np.testing.assert_array_equal(sharded.reconstruct_batch(ids[order]), vectors[order])
+
+
+def test_updated_leaves_original_untouched(sharded, data, tmp_path):
+    vectors, ids, queries = data
+    new_vectors = vectors[:5][:, ::-1].copy()
+    new_ids = np.concatenate([ids[:2], np.array([11, 12, 13], dtype=np.int64)])
+
+    updated = sharded.updated(str(tmp_path), ids[:10], new_vectors, new_ids)
+    try:
+        assert sharded.ntotal == len(ids)
+        assert updated.ntotal == len(ids) - 10 + 5
+
+        expected = flat_index(vectors, ids)
+        expected.remove_ids(ids[:10])
+        expected.add_with_ids(new_vectors, new_ids)
+        np.testing.assert_array_equal(updated.search(queries, 20)[1], expected.search(queries, 20)[1])
+    finally:
+        updated.close()
+
+
+def test_updated_index_outlives_its_staging_files(sharded, data, tmp_path):
+    _, ids, queries = data
+    staging = tmp_path / 'staging'
+    updated = sharded.updated(str(staging), ids[:1])
+    try:
+        updated.wait_ready()
+        shutil.rmtree(staging)
+        assert updated.ntotal == len(ids) - 1
+        assert ids[0] not in updated.search(queries, len(ids))[1]
+    finally:
+        updated.close()
+
+
+def test_concurrent_calls_get_their_own_results(sharded, data):
+    vectors, ids, queries = data
+    expected = flat_index(vectors, ids)
+
+    def query(i):
+        # Alternate full fan-out searches with single-shard lookups
+        if i % 2:
+            return sharded.reconstruct_batch(ids[i:i + 1])[0], vectors[i]
+        k = 1 + i % 10
+        return sharded.search(queries, k)[1], expected.search(queries, k)[1]
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        for result, wanted in pool.map(query, range(40)):
+            np.testing.assert_array_equal(result, wanted)
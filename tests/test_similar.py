@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from src.data_processor import movie_id
+from tests.fakes import FakeModel
+
+
+@pytest.fixture
+def vector_search(make_vector_search, catalog):
+    vector_search = make_vector_search()
+    vector_search.create_embeddings(catalog)
+    return vector_search
+
+
+def expected(catalog, seeds, combine, top_k):
+    """Brute-force (title, score) ranking over the catalog, seeds left out."""
+    vectors = FakeModel().encode(catalog['text_for_embedding'].tolist())
+    titles = catalog['Series_Title'].tolist()
+    seed_vectors = vectors[[titles.index(s) for s in seeds]]
+    if combine == 'centroid':
+        centroid = seed_vectors.mean(axis=0)
+        scores = vectors @ (centroid / np.linalg.norm(centroid))
+    else:
+        scores = (vectors @ seed_vectors.T).max(axis=1)
+    ranked = sorted((-score, title) for title, score in zip(titles, scores) if title not in seeds)
+    return [(title, -score) for score, title in ranked[:top_k]]
+
+
+def ranking(results):
+    return [(r['title'], r['similarity_score']) for r in results]
+
+
+def assert_ranking(results, wanted):
+    assert [title for title, _ in ranking(results)] == [title for title, _ in wanted]
+    np.testing.assert_allclose([s for _, s in ranking(results)], [s for _, s in wanted], rtol=1e-5)
+
+
+def test_single_seed_is_excluded(vector_search, catalog):
+    results = vector_search.similar_to("Alien", top_k=3)
+    assert_ranking(results, expected(catalog, ["Alien"], 'centroid', 3))
+    assert results[0]['title'] == "Aliens"
+    # Movie ids work as seeds too
+    assert ranking(vector_search.similar_to(movie_id("Alien"), top_k=3)) == ranking(results)
+
+
+@pytest.mark.parametrize("combine", ["centroid", "max"])
+def test_several_seeds(vector_search, catalog, combine):
+    seeds = ["Alien", "Heat"]
+    results = vector_search.similar_to(seeds, top_k=4, combine=combine)
+    assert_ranking(results, expected(catalog, seeds, combine, 4))
+    assert not {"Alien", "Heat"} & {r['title'] for r in results}
+
+
+def test_max_keeps_each_seeds_nearest_neighbor(vector_search):
+    # Up is far from both seeds, their own closest matches come first
+    titles = [r['title'] for r in vector_search.similar_to(["Alien", "Heat"], top_k=2, combine='max')]
+    assert sorted(titles) == ["Aliens", "Ronin"]
+
+
+def test_seeds_must_be_indexed_and_mode_known(vector_search):
+    with pytest.raises(ValueError):
+        vector_search.similar_to("Casablanca")
+    with pytest.raises(ValueError):
+        vector_search.similar_to(["Alien", "Heat"], combine='mean')
@@ -0,0 +1,80 @@
+import pickle
+
+import faiss
+import numpy as np
+import pandas as pd
+import pytest
+
+pytest.importorskip("sentence_transformers")
+
+from src.data_processor import movie_id
+from tests.fakes import DIMENSION, FakeModel
+from src.db.vector_search import _changed_rows, _rekey_positional_index
+
+
+def test_rekey_keeps_first_row_for_duplicate_titles():
+    titles = ["Drishyam", "Inception", "Drishyam", "Up"]
+    vectors = np.eye(4, 8, dtype=np.float32)
+    positional = faiss.IndexFlatIP(8)
+    positional.add(vectors)
+
+    index, index_to_movie = _rekey_positional_index(positional, dict(enumerate(titles)))
+
+    assert isinstance(index, faiss.IndexIDMap2)
+    assert index.ntotal == 3
+    ids = faiss.vector_to_array(index.id_map)
+    assert len(set(ids.tolist())) == 3
+    assert index_to_movie == {movie_id(t): t for t in ["Drishyam", "Inception", "Up"]}
+    # The first Drishyam row wins, as in create_embeddings
+    np.testing.assert_array_equal(index.reconstruct(movie_id("Drishyam")), vectors[0])
+    np.testing.assert_array_equal(index.reconstruct(movie_id("Up")), vectors[3])
+
+
+def texts_frame(rows):
+    df = pd.DataFrame(rows, columns=['Series_Title', 'text_for_embedding'])
+    df['Movie_ID'] = df['Series_Title'].map(movie_id).astype(np.int64)
+    return df
+
+
+def test_changed_rows_selects_new_and_rewritten_texts():
+    stored = texts_frame([("Same", "a"), ("Edited", "b"), ("Unindexed", "c")])
+    indexed = {movie_id("Same"), movie_id("Edited")}
+    delta = texts_frame([("Same", "a"), ("Edited", "b2"), ("Unindexed", "c"), ("New", "d")])
+
+    changed = _changed_rows(delta, stored, indexed)
+
+    assert delta['Series_Title'][changed].tolist() == ["Edited", "Unindexed", "New"]
+
+
+def test_changed_rows_without_stored_data_selects_everything():
+    delta = texts_frame([("A", "a"), ("B", "b")])
+    assert _changed_rows(delta, None, set()).tolist() == [True, True]
+
+
+def test_legacy_files_are_served_without_publishing(make_vector_search, catalog, monkeypatch, tmp_path):
+    from src.db import vector_search as module
+    from src.db.artifacts import DATA_FILE
+
+    positional = faiss.IndexFlatIP(DIMENSION)
+    positional.add(FakeModel().encode(catalog['text_for_embedding'].tolist()))
+    index_path, mapping_path = str(tmp_path / 'legacy.index'), str(tmp_path / 'legacy.pkl')
+    faiss.write_index(positional, index_path)
+    with open(mapping_path, 'wb') as f:
+        pickle.dump(dict(enumerate(catalog['Series_Title'])), f)
+    monkeypatch.setattr(module, 'EMBEDDINGS_INDEX_PATH', index_path)
+    monkeypatch.setattr(module, 'INDEX_TO_MOVIE_PATH', mapping_path)
+
+    vector_search = make_vector_search()
+    vector_search.load_embeddings(catalog)
+
+    assert vector_search.store.versions() == []
+    assert vector_search.version is None
+    assert vector_search.df is catalog
+    assert vector_search.search("space alien horror", top_k=1)[0]['title'] == "Alien"
+
+    # The first catalog update publishes the first bundle, with its movie data
+    assert vector_search.delete_movies(["Up"]) == 1
+    version = vector_search.store.current_version()
+    assert vector_search.version == version
+    assert DATA_FILE in vector_search.store.manifest(version)['files']
+    assert "Up" not in set(vector_search.store.load().df['Series_Title'])